@@ -0,0 +1,32 @@
+"""add match_store_build table
+
+Revision ID: 0d8e4b7a2c59
+Revises: b6e27c94d1f3
+Create Date: 2026-10-18 21:14:06.392817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d8e4b7a2c59'
+down_revision: Union[str, None] = 'b6e27c94d1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created empty: stored matches are ignored until a rebuild records its marker
+    op.create_table('match_store_build',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('min_score', sa.Float(), nullable=False),
+    sa.Column('built_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('match_store_build')
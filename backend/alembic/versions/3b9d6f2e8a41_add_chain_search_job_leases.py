@@ -0,0 +1,28 @@
+"""add chain search job leases
+
+Revision ID: 3b9d6f2e8a41
+Revises: 7c3f1e9a5b24
+Create Date: 2026-10-18 23:05:17.284903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d6f2e8a41'
+down_revision: Union[str, None] = '7c3f1e9a5b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('chain_search_jobs', sa.Column('lease_token', sa.String(length=32), nullable=True))
+    op.add_column('chain_search_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('chain_search_jobs', 'heartbeat_at')
+    op.drop_column('chain_search_jobs', 'lease_token')
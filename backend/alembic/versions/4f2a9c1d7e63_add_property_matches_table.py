@@ -0,0 +1,38 @@
+"""add property_matches table
+
+Revision ID: 4f2a9c1d7e63
+Revises: 1c04b82c02ef
+Create Date: 2026-10-18 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c1d7e63'
+down_revision: Union[str, None] = '1c04b82c02ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('property_matches',
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('components', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['target_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('source_id', 'target_id')
+    )
+    op.create_index(op.f('ix_property_matches_target_id'), 'property_matches', ['target_id'], unique=False)
+    op.create_index('ix_property_matches_source_id_score', 'property_matches', ['source_id', sa.text('score DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_property_matches_source_id_score', table_name='property_matches')
+    op.drop_index(op.f('ix_property_matches_target_id'), table_name='property_matches')
+    op.drop_table('property_matches')
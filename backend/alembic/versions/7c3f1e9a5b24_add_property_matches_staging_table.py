@@ -0,0 +1,32 @@
+"""add property_matches_staging table
+
+Revision ID: 7c3f1e9a5b24
+Revises: 0d8e4b7a2c59
+Create Date: 2026-10-18 21:48:30.118452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f1e9a5b24'
+down_revision: Union[str, None] = '0d8e4b7a2c59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('property_matches_staging',
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('components', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('source_id', 'target_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('property_matches_staging')
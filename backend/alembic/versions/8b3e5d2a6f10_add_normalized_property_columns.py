@@ -0,0 +1,82 @@
+"""add normalized property columns
+
+Revision ID: 8b3e5d2a6f10
+Revises: 4f2a9c1d7e63
+Create Date: 2026-10-18 11:04:27.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e5d2a6f10'
+down_revision: Union[str, None] = '4f2a9c1d7e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.core.normalization.PROPERTY_TYPE_CODES at this revision
+PROPERTY_TYPE_CODES = {
+    "residential": 1,
+    "multi_family": 2,
+    "commercial": 3,
+    "retail": 4,
+    "industrial": 5,
+    "land": 6,
+}
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('city', sa.String(), nullable=True))
+    op.add_column('properties', sa.Column('state', sa.String(), nullable=True))
+    op.add_column('properties', sa.Column('property_type_code', sa.SmallInteger(), nullable=True))
+
+    # Backfill with the same parsing the model applies on write
+    properties = sa.table(
+        'properties',
+        sa.column('id', sa.Integer),
+        sa.column('location', sa.String),
+        sa.column('property_type', sa.String),
+        sa.column('city', sa.String),
+        sa.column('state', sa.String),
+        sa.column('property_type_code', sa.SmallInteger),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(properties.c.id, properties.c.location, properties.c.property_type)).all()
+    updates = []
+    for prop_id, location, property_type in rows:
+        parts = (location or '').split(',')
+        updates.append({
+            'row_id': prop_id,
+            'city': parts[0].strip().lower(),
+            'state': parts[1].strip().lower() if len(parts) > 1 else '',
+            'property_type_code': PROPERTY_TYPE_CODES.get((property_type or '').lower(), 0),
+        })
+    statement = (
+        properties.update()
+        .where(properties.c.id == sa.bindparam('row_id'))
+        .values(
+            city=sa.bindparam('city'),
+            state=sa.bindparam('state'),
+            property_type_code=sa.bindparam('property_type_code'),
+        )
+    )
+    for start in range(0, len(updates), BATCH_SIZE):
+        bind.execute(statement, updates[start:start + BATCH_SIZE])
+
+    op.create_index(op.f('ix_properties_city'), 'properties', ['city'], unique=False)
+    op.create_index(op.f('ix_properties_state'), 'properties', ['state'], unique=False)
+    op.create_index(op.f('ix_properties_property_type_code'), 'properties', ['property_type_code'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_properties_property_type_code'), table_name='properties')
+    op.drop_index(op.f('ix_properties_state'), table_name='properties')
+    op.drop_index(op.f('ix_properties_city'), table_name='properties')
+    op.drop_column('properties', 'property_type_code')
+    op.drop_column('properties', 'state')
+    op.drop_column('properties', 'city')
@@ -0,0 +1,32 @@
+"""add property search indexes
+
+Revision ID: a3d81f6c2e94
+Revises: f5c9d3a71b26
+Create Date: 2026-10-18 19:12:40.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d81f6c2e94'
+down_revision: Union[str, None] = 'f5c9d3a71b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_properties_status_type_price', 'properties', ['status', 'property_type_code', 'price'], unique=False)
+    # Trigram index is Postgres only, as on the model
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_properties_location_trgm', 'properties', ['location'], unique=False, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_properties_location_trgm', table_name='properties')
+    op.drop_index('ix_properties_status_type_price', table_name='properties')
@@ -0,0 +1,35 @@
+"""add property full-text search
+
+Revision ID: b6e27c94d1f3
+Revises: a3d81f6c2e94
+Create Date: 2026-10-18 20:41:07.236915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e27c94d1f3'
+down_revision: Union[str, None] = 'a3d81f6c2e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Generated column, so Postgres keeps it current on every write and fills existing rows here
+    op.execute(
+        "ALTER TABLE properties ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(address, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index('ix_properties_search_vector', 'properties', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_properties_search_vector', table_name='properties', postgresql_using='gin')
+    op.drop_column('properties', 'search_vector')
@@ -0,0 +1,55 @@
+"""add property coordinates
+
+Revision ID: c7d14e9b2a58
+Revises: 8b3e5d2a6f10
+Create Date: 2026-10-18 13:27:05.661904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.geocoding import geocode
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d14e9b2a58'
+down_revision: Union[str, None] = '8b3e5d2a6f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('properties', sa.Column('longitude', sa.Float(), nullable=True))
+
+    # Backfill from the bundled gazetteer using the normalized city/state columns
+    properties = sa.table(
+        'properties',
+        sa.column('id', sa.Integer),
+        sa.column('city', sa.String),
+        sa.column('state', sa.String),
+        sa.column('latitude', sa.Float),
+        sa.column('longitude', sa.Float),
+    )
+    bind = op.get_bind()
+    updates = []
+    for prop_id, city, state in bind.execute(sa.select(properties.c.id, properties.c.city, properties.c.state)):
+        coordinates = geocode(city or '', state or '')
+        if coordinates is not None:
+            updates.append({'row_id': prop_id, 'latitude': coordinates[0], 'longitude': coordinates[1]})
+    statement = (
+        properties.update()
+        .where(properties.c.id == sa.bindparam('row_id'))
+        .values(latitude=sa.bindparam('latitude'), longitude=sa.bindparam('longitude'))
+    )
+    for start in range(0, len(updates), BATCH_SIZE):
+        bind.execute(statement, updates[start:start + BATCH_SIZE])
+
+
+def downgrade() -> None:
+    op.drop_column('properties', 'longitude')
+    op.drop_column('properties', 'latitude')
@@ -0,0 +1,53 @@
+"""add chain_search_jobs table
+
+Revision ID: e2a6b8f41c07
+Revises: c7d14e9b2a58
+Create Date: 2026-10-18 15:48:19.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6b8f41c07'
+down_revision: Union[str, None] = 'c7d14e9b2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('chain_search_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('request_hash', sa.String(length=64), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('params', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_chain_search_jobs_request_hash'), 'chain_search_jobs', ['request_hash'], unique=False)
+    op.create_index(
+        'ix_chain_search_jobs_active_request_hash',
+        'chain_search_jobs',
+        ['request_hash'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chain_search_jobs_active_request_hash', table_name='chain_search_jobs')
+    op.drop_index(op.f('ix_chain_search_jobs_request_hash'), table_name='chain_search_jobs')
+    op.drop_table('chain_search_jobs')
@@ -1,14 +1,16 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principals import principal_cache
+from app.db.session import AsyncSessionLocal, SessionLocal
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/api/v1/auth/login"
@@ -21,23 +23,41 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(reusable_oauth2)
-) -> models.User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def decode_token(token: str) -> schemas.TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        token_data = schemas.TokenPayload(**payload)
+        return schemas.TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+
+def cached_user(snapshot: dict) -> models.User:
+    """A detached User from a principal cache snapshot, ready for merge(load=False)."""
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(reusable_oauth2)
+) -> models.User:
+    snapshot = principal_cache.get(token)
+    if snapshot is not None:
+        # Attached without a SELECT, so updates and lazy loads work as usual
+        return db.merge(cached_user(snapshot), load=False)
+    token_data = decode_token(token)
     user = crud.user.get(db, id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    principal_cache.put(token, user, expires_at=token_data.exp)
     return user
 
 def get_current_active_user(
@@ -45,4 +65,42 @@ def get_current_active_user(
 ) -> models.User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user 
\ No newline at end of file
+    return current_user 
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(reusable_oauth2)
+) -> models.User:
+    snapshot = principal_cache.get(token)
+    if snapshot is not None:
+        return await db.merge(cached_user(snapshot), load=False)
+    token_data = decode_token(token)
+    # asyncpg binds parameters strictly, so the subject must already be an int
+    try:
+        user_id = int(token_data.sub)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+    user = await crud.user.get_async(db, id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    principal_cache.put(token, user, expires_at=token_data.exp)
+    return user
+
+async def get_current_active_user_async(
+    current_user: models.User = Depends(get_current_user_async),
+) -> models.User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+def get_current_active_superuser(
+    current_user: models.User = Depends(get_current_active_user),
+) -> models.User:
+    if not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=400, detail="The user doesn't have enough privileges"
+        )
+    return current_user
\ No newline at end of file
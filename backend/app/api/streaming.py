@@ -0,0 +1,39 @@
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+T = TypeVar("T")
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client asked for newline-delimited JSON in its Accept header."""
+    accepted = (part.split(";")[0].strip() for part in request.headers.get("accept", "").split(","))
+    return NDJSON_MEDIA_TYPE in accepted
+
+
+def ndjson_response(
+    produce: Callable[[Session], Iterable[T]],
+    serialize: Callable[[T], str],
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Stream `produce(db)` one JSON document per line.
+
+    The request's own session is closed before the body is sent, so `produce`
+    gets a session of its own that lives as long as the stream.
+    """
+    def lines() -> Iterator[str]:
+        db = SessionLocal()
+        try:
+            for item in produce(db):
+                yield serialize(item) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
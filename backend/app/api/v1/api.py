@@ -1,9 +1,15 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, properties, exchanges
+from app.api.v1.endpoints import auth, users, properties, exchanges, admin, jobs
+from app.api.v1.endpoints import async_exchanges, async_properties
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(properties.router, prefix="/properties", tags=["properties"])
-api_router.include_router(exchanges.router, prefix="/exchanges", tags=["exchanges"]) 
\ No newline at end of file
+api_router.include_router(exchanges.router, prefix="/exchanges", tags=["exchanges"]) 
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+# Same CRUD on the async engine; each request holds no threadpool thread
+api_router.include_router(async_properties.router, prefix="/async/properties", tags=["async"])
+api_router.include_router(async_exchanges.router, prefix="/async/exchanges", tags=["async"])
@@ -0,0 +1,42 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+
+from app import models
+from app.api import deps
+from app.api.v1.endpoints.properties import PropertyRing, to_property_rings
+from app.matching.clearing import run_market_clearing
+from app.matching.property_matcher import PropertyMatcher
+
+router = APIRouter()
+
+class MarketClearing(BaseModel):
+    deals: List[PropertyRing]
+    total_score: float
+    properties_matched: int
+    # Cycles the solver chose that give one owner two properties; excluded from the totals
+    rejected: List[PropertyRing]
+
+@router.post("/market-clearing", response_model=MarketClearing)
+def market_clearing(
+    *,
+    db: Session = Depends(deps.get_db),
+    min_score: float = 0.6,
+    max_edges_per_source: Optional[int] = None,
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Propose non-conflicting exchanges across all available properties,
+    maximizing the total match score. Nothing is persisted.
+
+    Cycles that would give one owner two properties are not deals; they
+    are listed under `rejected`.
+    """
+    result = run_market_clearing(db, min_score, max_edges_per_source)
+    return MarketClearing(
+        deals=to_property_rings(PropertyMatcher.hydrate_chains(db, result.deals)),
+        total_score=result.total_score,
+        properties_matched=result.properties_matched,
+        rejected=to_property_rings(PropertyMatcher.hydrate_chains(db, result.rejected)),
+    )
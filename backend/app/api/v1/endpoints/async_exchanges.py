@@ -0,0 +1,100 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+from app.api import deps
+from app.crud.pagination import InvalidCursor
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.Exchange])
+async def read_exchanges(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Retrieve exchanges. Same paging as GET /exchanges, without NDJSON streaming.
+    """
+    if skip:
+        if cursor:
+            raise HTTPException(status_code=400, detail="skip and cursor cannot be combined")
+        return await crud.exchange.get_multi_async(db, skip=skip, limit=limit)
+    try:
+        page = await crud.exchange.get_page_async(db, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.post("/", response_model=schemas.Exchange)
+async def create_exchange(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    exchange_in: schemas.ExchangeCreate,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Create new exchange.
+    """
+    exchange = await crud.exchange.create_with_owner_async(
+        db=db, obj_in=exchange_in, owner_id=current_user.id
+    )
+    return exchange
+
+@router.get("/{exchange_id}", response_model=schemas.Exchange)
+async def read_exchange(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    exchange_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Get exchange by ID.
+    """
+    exchange = await crud.exchange.get_async(db=db, id=exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail="Exchange not found")
+    return exchange
+
+@router.put("/{exchange_id}", response_model=schemas.Exchange)
+async def update_exchange(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    exchange_id: int,
+    exchange_in: schemas.ExchangeUpdate,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Update an exchange.
+    """
+    exchange = await crud.exchange.get_async(db=db, id=exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail="Exchange not found")
+    if not crud.user.is_superuser(current_user) and (exchange.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    exchange = await crud.exchange.update_async(db=db, db_obj=exchange, obj_in=exchange_in)
+    return exchange
+
+@router.delete("/{exchange_id}", response_model=schemas.Exchange)
+async def delete_exchange(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    exchange_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Delete an exchange.
+    """
+    exchange = await crud.exchange.get_async(db=db, id=exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail="Exchange not found")
+    if not crud.user.is_superuser(current_user) and (exchange.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    exchange = await crud.exchange.remove_async(db=db, id=exchange_id)
+    return exchange
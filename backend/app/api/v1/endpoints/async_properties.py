@@ -0,0 +1,119 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+from app.api import deps
+from app.crud.pagination import InvalidCursor
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.Property])
+async def read_properties(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    location: Optional[str] = Query(None, min_length=1),
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1),
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Retrieve properties, optionally filtered. Same parameters and paging as
+    GET /properties, without NDJSON streaming.
+    """
+    filters = {
+        "status": status,
+        "property_type": property_type,
+        "min_price": min_price,
+        "max_price": max_price,
+        "location": location,
+        "city": city,
+        "state": state,
+        "q": q,
+    }
+    if skip or q:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with skip or q")
+        return await crud.property.get_multi_async(db, skip=skip, limit=limit, **filters)
+    try:
+        page = await crud.property.get_page_async(db, cursor=cursor, limit=limit, **filters)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.post("/", response_model=schemas.Property)
+async def create_property(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    property_in: schemas.PropertyCreate,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Create new property.
+    """
+    property = await crud.property.create_with_owner_async(
+        db=db, obj_in=property_in, owner_id=current_user.id
+    )
+    return property
+
+@router.get("/{property_id}", response_model=schemas.Property)
+async def read_property(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    property_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Get property by ID.
+    """
+    property = await crud.property.get_async(db=db, id=property_id)
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return property
+
+@router.put("/{property_id}", response_model=schemas.Property)
+async def update_property(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    property_id: int,
+    property_in: schemas.PropertyUpdate,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Update a property.
+    """
+    property = await crud.property.get_async(db=db, id=property_id)
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+    if not crud.user.is_superuser(current_user) and (property.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    property = await crud.property.update_async(db=db, db_obj=property, obj_in=property_in)
+    return property
+
+@router.delete("/{property_id}", response_model=schemas.Property)
+async def delete_property(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    property_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
+) -> Any:
+    """
+    Delete a property.
+    """
+    property = await crud.property.get_async(db=db, id=property_id)
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+    if not crud.user.is_superuser(current_user) and (property.owner_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    property = await crud.property.remove_async(db=db, id=property_id)
+    return property
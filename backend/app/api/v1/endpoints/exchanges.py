@@ -1,24 +1,56 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.streaming import ndjson_response, wants_ndjson
+from app.core.config import settings
+from app.crud.pagination import InvalidCursor
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Exchange])
 def read_exchanges(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve exchanges.
+
+    Pages are keyed by id: pass the `X-Next-Cursor` response header back as
+    `cursor` for the next page; the header is absent on the last page.
+    `skip` still works, but only without a cursor.
+
+    `limit` defaults to 100. With `Accept: application/x-ndjson` the
+    exchanges are streamed one per line through a server-side cursor, and
+    an omitted `limit` streams every match.
     """
-    exchanges = crud.exchange.get_multi(db, skip=skip, limit=limit)
-    return exchanges
+    if wants_ndjson(request):
+        return ndjson_response(
+            lambda stream_db: crud.exchange.stream_multi(
+                stream_db, skip=skip, limit=limit, batch_size=settings.STREAM_BATCH_SIZE
+            ),
+            lambda exchange: schemas.Exchange.model_validate(exchange).model_dump_json(),
+        )
+    if limit is None:
+        limit = 100
+    if skip:
+        if cursor:
+            raise HTTPException(status_code=400, detail="skip and cursor cannot be combined")
+        return crud.exchange.get_multi(db, skip=skip, limit=limit)
+    try:
+        page = crud.exchange.get_page(db, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.post("/", response_model=schemas.Exchange)
 def create_exchange(
@@ -0,0 +1,54 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.api.v1.endpoints.properties import PropertyChain, to_property_chains
+from app.matching.property_matcher import PropertyMatcher
+
+router = APIRouter()
+
+def get_job_or_404(db: Session, job_id: str, current_user: models.User) -> models.ChainSearchJob:
+    """The job, if the current user started it or is a superuser."""
+    job = db.get(models.ChainSearchJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not crud.user.is_superuser(current_user) and (job.created_by != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return job
+
+@router.get("/{job_id}", response_model=schemas.ChainSearchJob)
+def read_job(
+    *,
+    db: Session = Depends(deps.get_db),
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get a background job's status and progress.
+    """
+    return get_job_or_404(db, job_id, current_user)
+
+@router.get("/{job_id}/result", response_model=List[PropertyChain])
+def read_job_result(
+    *,
+    db: Session = Depends(deps.get_db),
+    response: Response,
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get the chains found by a finished chain search job.
+
+    Chains through properties deleted since the search ran are left out.
+    """
+    job = get_job_or_404(db, job_id, current_user)
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail="Job has not finished")
+
+    response.headers["X-Chain-Search-Exhaustive"] = str(job.result["exhaustive"]).lower()
+    chains = [[(prop_id, score) for prop_id, score in chain] for chain in job.result["chains"]]
+    return to_property_chains(PropertyMatcher.hydrate_chains(db, chains))
@@ -1,26 +1,155 @@
-from typing import Any, List, Tuple
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from typing import Any, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.streaming import ndjson_response, wants_ndjson
+from app.core.config import settings
+from app.crud import property_import
+from app.crud.pagination import InvalidCursor
+from app.jobs import chain_search as chain_search_jobs
+from app.matching import catalog_version
 from app.matching.property_matcher import PropertyMatcher
 
 router = APIRouter()
 
+class PropertyMatch(BaseModel):
+    property: schemas.Property
+    match_score: float
+
+class PropertyChain(BaseModel):
+    properties: List[PropertyMatch]
+    average_score: float
+
+class PropertyRing(BaseModel):
+    properties: List[PropertyMatch]
+    average_score: float
+
+class BatchMatchRequest(BaseModel):
+    property_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    min_score: float = 0.6
+    limit: int = 10
+
+class BatchMatchResult(BaseModel):
+    property_id: int
+    matches: List[PropertyMatch]
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers `etag`."""
+    candidates = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def to_property_chains(chains: List[List[Tuple[models.Property, float]]]) -> List[PropertyChain]:
+    return [
+        PropertyChain(
+            properties=[
+                PropertyMatch(property=prop, match_score=score)
+                for prop, score in chain
+            ],
+            average_score=sum(score for _, score in chain) / len(chain)
+        )
+        for chain in chains
+    ]
+
+def to_property_rings(rings: List[List[Tuple[models.Property, float]]]) -> List[PropertyRing]:
+    return [
+        PropertyRing(
+            properties=[
+                PropertyMatch(property=prop, match_score=score)
+                for prop, score in ring
+            ],
+            average_score=sum(score for _, score in ring) / len(ring)
+        )
+        for ring in rings
+    ]
+
 @router.get("/", response_model=List[schemas.Property])
 def read_properties(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    location: Optional[str] = Query(None, min_length=1),
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve properties, optionally filtered.
+
+    `location` matches any part of the location text; `city` and `state`
+    match the normalized parts exactly. `q` is a full-text search over
+    address and description; results are then ranked by relevance and paged
+    with `skip` only.
+
+    Pages are keyed by id: pass the `X-Next-Cursor` response header back as
+    `cursor` for the next page; the header is absent on the last page.
+    `skip` still works, but only without a cursor.
+
+    `limit` defaults to 100. With `Accept: application/x-ndjson` the
+    properties are streamed one per line through a server-side cursor, and
+    an omitted `limit` streams every match.
+    """
+    filters = {
+        "status": status,
+        "property_type": property_type,
+        "min_price": min_price,
+        "max_price": max_price,
+        "location": location,
+        "city": city,
+        "state": state,
+        "q": q,
+    }
+    if wants_ndjson(request):
+        return ndjson_response(
+            lambda stream_db: crud.property.stream_multi(
+                stream_db, skip=skip, limit=limit, batch_size=settings.STREAM_BATCH_SIZE, **filters
+            ),
+            lambda prop: schemas.Property.model_validate(prop).model_dump_json(),
+        )
+    if limit is None:
+        limit = 100
+    if skip or q:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with skip or q")
+        return crud.property.get_multi(db, skip=skip, limit=limit, **filters)
+    try:
+        page = crud.property.get_page(db, cursor=cursor, limit=limit, **filters)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.get("/exchange-rings", response_model=List[PropertyRing])
+def find_all_exchange_rings(
+    *,
+    db: Session = Depends(deps.get_db),
+    max_ring_length: int = Query(3, ge=2, le=6),
+    min_score: float = 0.6,
     limit: int = 100,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Retrieve properties.
+    Find closed swap rings across the whole available catalog.
     """
-    properties = crud.property.get_multi(db, skip=skip, limit=limit)
-    return properties
+    rings = PropertyMatcher.find_all_exchange_rings(
+        db=db,
+        max_ring_length=max_ring_length,
+        min_score=min_score,
+        limit=limit
+    )
+    return to_property_rings(rings)
 
 @router.post("/", response_model=schemas.Property)
 def create_property(
@@ -37,6 +166,27 @@ def create_property(
     )
     return property
 
+@router.post("/import", response_model=schemas.PropertyImportReport)
+def import_properties(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Bulk-create the current user's listings from a CSV (header row of
+    PropertyCreate fields) or NDJSON upload. Valid rows are saved in batches;
+    the report lists every row that was not, with the reasons.
+    """
+    fmt = format or property_import.detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format=csv or format=ndjson")
+    return property_import.import_properties(
+        db, file.file, fmt, owner_id=current_user.id, batch_size=batch_size
+    )
+
 @router.get("/{property_id}", response_model=schemas.Property)
 def read_property(
     *,
@@ -89,35 +239,52 @@ def delete_property(
     property = crud.property.remove(db=db, id=property_id)
     return property
 
-class PropertyMatch(BaseModel):
-    property: schemas.Property
-    match_score: float
-
-class PropertyChain(BaseModel):
-    properties: List[PropertyMatch]
-    average_score: float
-
 @router.get("/{property_id}/matches", response_model=List[PropertyMatch])
 def find_matching_properties(
     *,
     db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
     property_id: int,
     min_score: float = 0.6,
     limit: int = 10,
+    radius_miles: Optional[float] = Query(None, gt=0),
+    probes: Optional[int] = Query(None, ge=0),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Find matching properties for a given property based on advanced matching criteria.
+
+    `probes` always selects the approximate bucket index, trading recall for
+    speed, even where precomputed matches would answer exactly; probing every
+    bucket returns the exact matches. It cannot be combined with `radius_miles`.
+
+    Responses carry an ETag that changes with the catalog; send it back in
+    If-None-Match to get a 304 while nothing has changed.
     """
+    if radius_miles is not None and probes is not None:
+        raise HTTPException(status_code=400, detail="radius_miles and probes cannot be combined")
     property = crud.property.get(db=db, id=property_id)
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
+    if radius_miles is not None and property.latitude is None:
+        raise HTTPException(status_code=400, detail="Property location could not be geocoded")
 
-    matches = PropertyMatcher.find_matching_properties(
+    version = catalog_version.current(db)
+    cache_key = PropertyMatcher.match_cache_key(property_id, min_score, limit, radius_miles, probes, version)
+    etag = f'"{hashlib.sha1(repr(cache_key).encode()).hexdigest()}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    matches = PropertyMatcher.find_matching_properties_cached(
         db=db,
         source_property=property,
         min_score=min_score,
-        limit=limit
+        limit=limit,
+        radius_miles=radius_miles,
+        probes=probes,
+        version=version
     )
 
     return [
@@ -125,36 +292,174 @@ def find_matching_properties(
         for prop, score in matches
     ]
 
+@router.post("/matches:batch", response_model=List[BatchMatchResult])
+def find_matching_properties_batch(
+    *,
+    db: Session = Depends(deps.get_db),
+    batch_in: BatchMatchRequest,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Find matching properties for many source properties in one request.
+    """
+    property_ids = list(dict.fromkeys(batch_in.property_ids))
+    sources = {
+        prop.id: prop
+        for prop in db.query(models.Property).filter(models.Property.id.in_(property_ids)).all()
+    }
+    if len(sources) != len(property_ids):
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    matches = PropertyMatcher.find_matching_properties_batch(
+        db=db,
+        source_properties=[sources[property_id] for property_id in property_ids],
+        min_score=batch_in.min_score,
+        limit=batch_in.limit
+    )
+
+    return [
+        BatchMatchResult(
+            property_id=property_id,
+            matches=[
+                PropertyMatch(property=prop, match_score=score)
+                for prop, score in matches[property_id]
+            ]
+        )
+        for property_id in property_ids
+    ]
+
 @router.get("/{property_id}/exchange-chains", response_model=List[PropertyChain])
 def find_exchange_chains(
     *,
     db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
     property_id: int,
-    max_chain_length: int = 3,
+    max_chain_length: int = Query(3, ge=1),
     min_score: float = 0.6,
+    mode: Literal["exhaustive", "best_first"] = "exhaustive",
+    top_k: int = Query(20, ge=1),
+    beam_width: Optional[int] = Query(1000, ge=1),
+    time_budget_ms: Optional[int] = Query(None, ge=0),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Identify potential exchange chains for a given property.
+
+    `mode=best_first` returns only the `top_k` best chains, bounded by
+    `beam_width` and `time_budget_ms`. The `X-Chain-Search-Exhaustive`
+    response header reports whether the search was cut short.
+
+    With `Accept: application/x-ndjson` chains are streamed one per line.
+    Exhaustive searches then stream chains as they are found, in discovery
+    order instead of by score.
     """
     property = crud.property.get(db=db, id=property_id)
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    chains = PropertyMatcher.identify_exchange_chains(
+    if wants_ndjson(request) and mode == "exhaustive":
+        def stream_chains(stream_db: Session):
+            source = crud.property.get(db=stream_db, id=property_id)
+            if source is None:
+                return iter(())
+            return PropertyMatcher.iter_exchange_chains(
+                db=stream_db,
+                source_property=source,
+                max_chain_length=max_chain_length,
+                min_score=min_score,
+                batch_size=settings.STREAM_BATCH_SIZE
+            )
+
+        return ndjson_response(
+            stream_chains,
+            lambda chain: to_property_chains([chain])[0].model_dump_json(),
+            headers={"X-Chain-Search-Exhaustive": "true"},
+        )
+
+    chains, exhaustive = PropertyMatcher.find_exchange_chains_coalesced(
         db=db,
         source_property=property,
         max_chain_length=max_chain_length,
-        min_score=min_score
+        min_score=min_score,
+        mode=mode,
+        top_k=top_k,
+        beam_width=beam_width,
+        time_budget_ms=time_budget_ms
     )
+    response.headers["X-Chain-Search-Exhaustive"] = str(exhaustive).lower()
 
-    return [
-        PropertyChain(
-            properties=[
-                PropertyMatch(property=prop, match_score=score)
-                for prop, score in chain
-            ],
-            average_score=sum(score for _, score in chain) / len(chain)
+    if wants_ndjson(request):
+        # Best-first results are capped at top_k, so only serialization is streamed
+        property_chains = to_property_chains(chains)
+        return ndjson_response(
+            lambda stream_db: property_chains,
+            lambda chain: chain.model_dump_json(),
+            headers={"X-Chain-Search-Exhaustive": response.headers["X-Chain-Search-Exhaustive"]},
         )
-        for chain in chains
-    ] 
\ No newline at end of file
+    return to_property_chains(chains)
+
+@router.post("/{property_id}/exchange-chains/jobs", response_model=schemas.ChainSearchJob, status_code=202)
+def start_exchange_chain_search(
+    *,
+    db: Session = Depends(deps.get_db),
+    property_id: int,
+    max_chain_length: int = Query(3, ge=1),
+    min_score: float = 0.6,
+    mode: Literal["exhaustive", "best_first"] = "exhaustive",
+    top_k: int = Query(20, ge=1),
+    beam_width: Optional[int] = Query(1000, ge=1),
+    time_budget_ms: Optional[int] = Query(None, ge=0),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Start an exchange chain search in the background; poll it under /jobs.
+
+    Takes the same parameters as GET exchange-chains. An identical search
+    you started that is still queued or running is returned instead of
+    starting another. Only you, or a superuser, can read the job.
+    """
+    property = crud.property.get(db=db, id=property_id)
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    return chain_search_jobs.submit_chain_search(
+        db,
+        property_id,
+        {
+            "max_chain_length": max_chain_length,
+            "min_score": min_score,
+            "mode": mode,
+            "top_k": top_k,
+            "beam_width": beam_width,
+            "time_budget_ms": time_budget_ms,
+        },
+        created_by=current_user.id,
+    )
+
+@router.get("/{property_id}/exchange-rings", response_model=List[PropertyRing])
+def find_exchange_rings(
+    *,
+    db: Session = Depends(deps.get_db),
+    property_id: int,
+    max_ring_length: int = Query(3, ge=2, le=6),
+    min_score: float = 0.6,
+    limit: int = 20,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Find closed swap rings through a given property, where the last owner
+    in the ring receives the given property.
+    """
+    property = crud.property.get(db=db, id=property_id)
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    rings = PropertyMatcher.find_exchange_rings(
+        db=db,
+        source_property=property,
+        max_ring_length=max_ring_length,
+        min_score=min_score,
+        limit=limit
+    )
+    return to_property_rings(rings)
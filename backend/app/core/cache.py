@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from app.core.metrics import registry
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache whose entries also expire `ttl_seconds` after
+    being stored. Hits, misses and evictions (overflow or expiry) are
+    counted in the metrics registry under `<name>_cache_*`.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = registry.counter(f"{name}_cache_hits_total", f"Lookups served from the {name} cache")
+        self.misses = registry.counter(f"{name}_cache_misses_total", f"Lookups not found in the {name} cache")
+        self.evictions = registry.counter(
+            f"{name}_cache_evictions_total", f"Entries dropped from the {name} cache by size or age"
+        )
+        registry.gauge(f"{name}_cache_entries", f"Entries in the {name} cache", lambda: len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The cached value, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.evictions.inc()
+                entry = None
+            if entry is None:
+                self.misses.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits.inc()
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store `value`; `ttl_seconds` shortens (never extends) the cache-wide TTL."""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions.inc()
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Drop every entry whose value matches `predicate`; returns how many were dropped."""
+        with self._lock:
+            stale = [key for key, (_, value) in self._entries.items() if predicate(value)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
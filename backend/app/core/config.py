@@ -30,6 +30,72 @@ class Settings(BaseSettings):
             return v
         return f"postgresql://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/{values.get('POSTGRES_DB')}"
 
+    # Same database through an asyncio driver, for the /async endpoints
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    @validator("ASYNC_DATABASE_URL", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: dict[str, Any]) -> Any:
+        if isinstance(v, str):
+            return v
+        url = values.get("DATABASE_URL") or ""
+        for sync_prefix, async_prefix in (
+            ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+
+    # Connection pool, applied to the sync and the async engine separately.
+    # Seconds for the timeout and recycle; recycle -1 keeps connections forever
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = True
+
+    # Materialized pairwise scores in property_matches; requests with a lower
+    # min_score than the stored floor fall back to live scoring
+    MATCH_STORE_ENABLED: bool = True
+    MATCH_STORE_MIN_SCORE: float = 0.6
+
+    # Cached match results, keyed by catalog version so writes never serve stale entries
+    MATCH_CACHE_SIZE: int = 10000
+    MATCH_CACHE_TTL_SECONDS: int = 300
+    # How long a request waits on an identical in-flight match or chain
+    # search before computing on its own
+    COALESCE_WAIT_SECONDS: float = 30.0
+
+    # Authenticated users cached per token; a change made by another process
+    # is seen after at most AUTH_CACHE_TTL_SECONDS. 0 disables the cache
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # bcrypt runs on PASSWORD_HASH_WORKERS threads with at most
+    # PASSWORD_HASH_QUEUE_SIZE callers waiting; beyond that requests get a 503.
+    # The cost factor is calibrated at startup to take about
+    # PASSWORD_HASH_TARGET_MS, unless PASSWORD_HASH_ROUNDS pins it (set it when
+    # workers run on different hardware, or they will keep rehashing each
+    # other's passwords)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_ROUNDS: Optional[int] = None
+
+    # In-process worker pool for background chain searches. Running jobs
+    # heartbeat on their own timer; one silent for JOB_STALE_AFTER_SECONDS
+    # is assumed lost and requeued
+    JOB_WORKERS: int = 2
+    JOB_HEARTBEAT_SECONDS: int = 30
+    JOB_STALE_AFTER_SECONDS: int = 600
+
+    # Rows fetched per round trip by NDJSON streaming endpoints
+    STREAM_BATCH_SIZE: int = 500
+
+    # Rows per transaction in bulk property imports
+    IMPORT_BATCH_SIZE: int = 1000
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr = "admin@example.com"
     FIRST_SUPERUSER_PASSWORD: str = "admin"
@@ -0,0 +1,63 @@
+import csv
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.core.normalization import split_location
+
+# Offline gazetteer of every US place with 500+ residents, from GeoNames
+# (geonames.org, CC BY 4.0), plus "St."/"Saint" spellings; no network geocoding
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "us_cities.csv")
+
+STATE_ABBREVIATIONS = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "district of columbia": "dc",
+    "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id", "illinois": "il",
+    "indiana": "in", "iowa": "ia", "kansas": "ks", "kentucky": "ky", "louisiana": "la",
+    "maine": "me", "maryland": "md", "massachusetts": "ma", "michigan": "mi", "minnesota": "mn",
+    "mississippi": "ms", "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv",
+    "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm", "new york": "ny",
+    "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or",
+    "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc", "south dakota": "sd",
+    "tennessee": "tn", "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va",
+    "washington": "wa", "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy",
+}
+
+Coordinates = Tuple[float, float]
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer() -> Tuple[Dict[Tuple[str, str], Coordinates], Dict[str, List[Tuple[Coordinates, int]]]]:
+    """Index the gazetteer by (city, state), and by city alone with populations, all lowercased."""
+    by_city_state: Dict[Tuple[str, str], Coordinates] = {}
+    by_city: Dict[str, List[Tuple[Coordinates, int]]] = {}
+    with open(GAZETTEER_PATH, newline="") as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            coordinates = (float(row["latitude"]), float(row["longitude"]))
+            city = row["city"].strip().lower()
+            by_city_state[(city, row["state"].strip().lower())] = coordinates
+            by_city.setdefault(city, []).append((coordinates, int(row["population"])))
+    return by_city_state, by_city
+
+
+def geocode(city: str, state: str) -> Optional[Coordinates]:
+    """
+    Look up normalized city and state parts in the gazetteer.
+
+    Full state names are accepted. Without a state, a city name resolves
+    when one place of that name holds most of their combined population,
+    as Austin, Texas does; otherwise it is ambiguous.
+    """
+    by_city_state, by_city = load_gazetteer()
+    if state:
+        return by_city_state.get((city, STATE_ABBREVIATIONS.get(state, state)))
+    candidates = sorted(by_city.get(city, []), key=lambda candidate: candidate[1], reverse=True)
+    if not candidates:
+        return None
+    (coordinates, population), others = candidates[0], candidates[1:]
+    return coordinates if population > sum(other for _, other in others) else None
+
+
+def geocode_location(location: Optional[str]) -> Optional[Coordinates]:
+    """Geocode a "City, State" string."""
+    return geocode(*split_location(location))
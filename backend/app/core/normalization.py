@@ -0,0 +1,25 @@
+from typing import Optional, Tuple
+
+# Stable smallint codes stored in properties.property_type_code
+PROPERTY_TYPE_CODES = {
+    "residential": 1,
+    "multi_family": 2,
+    "commercial": 3,
+    "retail": 4,
+    "industrial": 5,
+    "land": 6,
+}
+UNKNOWN_PROPERTY_TYPE = 0
+
+
+def split_location(location: Optional[str]) -> Tuple[str, str]:
+    """Split a "City, State" string into normalized (city, state) parts."""
+    parts = (location or "").split(',')
+    city = parts[0].strip().lower()
+    state = parts[1].strip().lower() if len(parts) > 1 else ''
+    return city, state
+
+
+def property_type_code(property_type: Optional[str]) -> int:
+    """Map a free-text property type to its smallint code; unrecognized types map to 0."""
+    return PROPERTY_TYPE_CODES.get((property_type or '').lower(), UNKNOWN_PROPERTY_TYPE)
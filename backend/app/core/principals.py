@@ -0,0 +1,45 @@
+import time
+from typing import Any, Dict, Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+class PrincipalCache:
+    """
+    Verified access token -> column snapshot of its user, so authenticated
+    requests skip the user lookup. Entries live at most `ttl_seconds` and
+    never past the token's own expiry; `invalidate` drops a user's entries
+    at once in this process, other processes catch up within the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.enabled = ttl_seconds > 0
+        self._cache = LRUCache("principal", maxsize, ttl_seconds)
+        self.invalidations = registry.counter(
+            "principal_cache_invalidations_total", "Cached principals dropped because their user changed"
+        )
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        return self._cache.get(token)
+
+    def put(self, token: str, user: Any, expires_at: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        snapshot = {column.key: getattr(user, column.key) for column in user.__table__.columns}
+        ttl = None if expires_at is None else expires_at - time.time()
+        if ttl is not None and ttl <= 0:
+            return
+        self._cache.set(token, snapshot, ttl_seconds=ttl)
+
+    def invalidate(self, user_id: int) -> None:
+        self.invalidations.inc(self._cache.discard_where(lambda snapshot: snapshot["id"] == user_id))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
@@ -1,13 +1,87 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+# Bounds for the calibrated bcrypt cost; each step doubles the hashing time
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 15
+
+# bcrypt runs on its own small pool so a burst of logins cannot occupy every
+# request thread; callers past the queue limit are turned away at once
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE)
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+_hash_seconds = registry.histogram("password_hash_seconds", "Time spent in one bcrypt call: hash, verify, or verify and rehash")
+_hash_rejections = registry.counter(
+    "password_hash_rejections_total", "Hashing requests refused because the hashing queue was full"
+)
+registry.gauge("password_hash_in_flight", "Hashing requests running or queued", lambda: _in_flight)
+registry.gauge("password_hash_rounds", "bcrypt cost factor used for new hashes", lambda: current_hash_rounds())
+
+
+class PasswordHashingBusy(Exception):
+    """Every hashing worker and queue slot is taken; served as 503."""
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Any:
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        _hash_seconds.observe(time.perf_counter() - started)
+
+
+def _track_in_flight(delta: int) -> None:
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+
+
+def _run_hashing(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run one bcrypt call on the hashing pool and wait for it.
+
+    The wait still blocks the calling thread. Every caller is a sync route,
+    which FastAPI runs on a worker thread, so only that worker waits; the
+    pool bounds how many bcrypt calls run at once. An async route must not
+    call this on the event loop: it would stall every other request, so it
+    is refused here.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("Password hashing blocks; call it from a sync route or a worker thread")
+    if not _hash_slots.acquire(blocking=False):
+        _hash_rejections.inc()
+        raise PasswordHashingBusy()
+    _track_in_flight(1)
+    try:
+        return _hash_executor.submit(_timed, fn, *args).result()
+    finally:
+        _track_in_flight(-1)
+        _hash_slots.release()
+
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
@@ -22,7 +96,35 @@ def create_access_token(
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_hashing(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and return a fresh hash as well when the stored one uses a different cost."""
+    return _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return _run_hashing(pwd_context.hash, password)
+
+def current_hash_rounds() -> int:
+    return pwd_context.handler("bcrypt").default_rounds
+
+def set_hash_rounds(rounds: int) -> None:
+    """Hash new passwords at `rounds`; hashes at any other cost then need an update."""
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds)
+
+def calibrate_hash_rounds(target_ms: float, samples: int = 3) -> int:
+    """The bcrypt cost whose hash time on this host is closest to `target_ms`."""
+    handler = pwd_context.handler("bcrypt").using(rounds=BCRYPT_MIN_ROUNDS)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash("calibration")
+        timings.append(time.perf_counter() - started)
+    baseline_ms = sorted(timings)[len(timings) // 2] * 1000
+    rounds = BCRYPT_MIN_ROUNDS + round(math.log2(target_ms / baseline_ms))
+    rounds = max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
+    logger.info(
+        "bcrypt cost %d chosen for a %.0fms target (cost %d took %.1fms)",
+        rounds, target_ms, BCRYPT_MIN_ROUNDS, baseline_ms,
+    )
+    return rounds
@@ -0,0 +1,71 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.metrics import registry
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    function, later callers block until it finishes and share its result or
+    exception. Nothing is kept once the call completes.
+
+    A waiting caller first runs `before_wait`, to give up resources such as
+    a pooled database connection, and after `timeout` seconds stops waiting
+    and runs the function itself.
+
+    Shared results cross request threads, so they must not hold objects tied
+    to the leader's database session.
+    """
+
+    def __init__(self, name: str):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = registry.counter(
+            f"{name}_coalesced_requests_total", f"{name} requests that waited on an identical in-flight request"
+        )
+        self.timeouts = registry.counter(
+            f"{name}_coalesce_timeouts_total", f"{name} requests that gave up waiting and computed on their own"
+        )
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        before_wait: Optional[Callable[[], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self.coalesced.inc()
+            if before_wait is not None:
+                before_wait()
+            if not call.done.wait(timeout):
+                self.timeouts.inc()
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -1,8 +1,10 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterator, List, Optional, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
+from app.crud.pagination import Page, paginate
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -22,10 +24,35 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def filter_query(self, db: Session) -> Query:
+        """Base query for the list methods; subclasses add keyword filters."""
+        return db.query(self.model)
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, **filters: Any
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self.filter_query(db, **filters).offset(skip).limit(limit).all()
+
+    def get_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100, **filters: Any
+    ) -> Page:
+        """Keyset-paginated get_multi; raises InvalidCursor for a malformed cursor."""
+        return paginate(self.filter_query(db, **filters), self.model, cursor, limit)
+
+    def stream_multi(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        **filters: Any
+    ) -> Iterator[ModelType]:
+        """Like get_multi, but fetched `batch_size` rows at a time through a server-side cursor."""
+        query = self.filter_query(db, **filters).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return iter(query.yield_per(batch_size))
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -59,4 +86,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
-        return obj 
\ No newline at end of file
+        return obj
+
+    # Async variants for AsyncSession callers. Each runs the sync method on the
+    # session's sync facade via run_sync, so subclass overrides (filters)
+    # apply unchanged while the I/O stays on the event loop. Writes with heavy
+    # CPU work, like CRUDProperty's match store upkeep, override these to run
+    # in the thread pool.
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, **filters: Any
+    ) -> List[ModelType]:
+        return await db.run_sync(lambda sync_db: self.get_multi(sync_db, skip=skip, limit=limit, **filters))
+
+    async def get_page_async(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100, **filters: Any
+    ) -> Page:
+        return await db.run_sync(lambda sync_db: self.get_page(sync_db, cursor=cursor, limit=limit, **filters))
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        return await db.run_sync(lambda sync_db: self.create(sync_db, obj_in=obj_in))
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        return await db.run_sync(lambda sync_db: self.update(sync_db, db_obj=db_obj, obj_in=obj_in))
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> ModelType:
+        return await db.run_sync(lambda sync_db: self.remove(sync_db, id=id))
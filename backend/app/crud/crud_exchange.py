@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
@@ -17,6 +18,13 @@ class CRUDExchange(CRUDBase[Exchange, ExchangeCreate, ExchangeUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    async def create_with_owner_async(
+        self, db: AsyncSession, *, obj_in: ExchangeCreate, owner_id: int
+    ) -> Exchange:
+        return await db.run_sync(
+            lambda sync_db: self.create_with_owner(sync_db, obj_in=obj_in, owner_id=owner_id)
+        )
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> List[Exchange]:
@@ -1,8 +1,16 @@
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import insert, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
+from app.core.normalization import PROPERTY_TYPE_CODES, property_type_code
 from app.crud.base import CRUDBase
+from app.db import full_text
+from app.db.session import SessionLocal
+from app.matching import catalog_version
+from app.matching.property_matcher import PropertyMatcher
 from app.models.property import Property
 from app.schemas.property import PropertyCreate, PropertyUpdate
 
@@ -13,10 +21,126 @@ class CRUDProperty(CRUDBase[Property, PropertyCreate, PropertyUpdate]):
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data, owner_id=owner_id)
         db.add(db_obj)
+        db.flush()
+        catalog_version.bump(db)
+        PropertyMatcher.refresh_stored_matches(db, db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def create_many_with_owner(
+        self, db: Session, *, objs_in: List[PropertyCreate], owner_id: int
+    ) -> List[int]:
+        """
+        Insert a batch of listings in one transaction with batched INSERTs,
+        keeping the match store and catalog version in step. Returns the new ids.
+        """
+        if not objs_in:
+            return []
+        rows = []
+        for obj_in in objs_in:
+            # Built through the model so the location and type validators fill
+            # the normalized and coordinate columns, exactly as for one listing
+            db_obj = self.model(**jsonable_encoder(obj_in), owner_id=owner_id)
+            rows.append({column.key: getattr(db_obj, column.key) for column in self.model.__table__.columns
+                         if column.key in db_obj.__dict__})
+        ids = list(db.scalars(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True), rows
+        ))
+        catalog_version.bump(db)
+        PropertyMatcher.add_stored_matches(db, ids)
+        db.commit()
+        return ids
+
+    def filter_query(
+        self,
+        db: Session,
+        *,
+        status: Optional[str] = None,
+        property_type: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        location: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        q: Optional[str] = None,
+    ) -> Query:
+        """
+        Properties matching every given filter. With `q`, only full-text
+        matches on address and description, ordered by relevance.
+        """
+        query = db.query(self.model)
+
+        # status, property_type_code and price lead ix_properties_status_type_price
+        if status:
+            query = query.filter(self.model.status == status)
+
+        if property_type:
+            if property_type.lower() in PROPERTY_TYPE_CODES:
+                query = query.filter(self.model.property_type_code == property_type_code(property_type))
+            else:
+                query = query.filter(self.model.property_type == property_type)
+
+        if min_price is not None:
+            query = query.filter(self.model.price >= min_price)
+
+        if max_price is not None:
+            query = query.filter(self.model.price <= max_price)
+
+        # Served by the trigram index on Postgres
+        if location:
+            query = query.filter(
+                or_(
+                    self.model.location.ilike(f"%{location}%"),
+                )
+            )
+
+        # city and state are stored normalized, so these hit their indexes directly
+        if city:
+            query = query.filter(self.model.city == city.strip().lower())
+
+        if state:
+            query = query.filter(self.model.state == state.strip().lower())
+
+        if q and q.strip():
+            query = full_text.search(query, self.model, q)
+
+        return query
+
+    # Listing writes rescore the match store, CPU-bound NumPy work that must
+    # not run on the event loop; the async variants run the sync write on its
+    # own session in the thread pool instead of through run_sync
+    async def _write_in_threadpool(self, db: AsyncSession, write: Callable[[Session], Property]) -> Property:
+        # Give the request's connection back while the write holds its own
+        await db.commit()
+
+        def run() -> Property:
+            with SessionLocal() as sync_db:
+                return write(sync_db)
+
+        return await run_in_threadpool(run)
+
+    async def create_with_owner_async(
+        self, db: AsyncSession, *, obj_in: PropertyCreate, owner_id: int
+    ) -> Property:
+        return await self._write_in_threadpool(
+            db, lambda sync_db: self.create_with_owner(sync_db, obj_in=obj_in, owner_id=owner_id)
+        )
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Property,
+        obj_in: PropertyUpdate | Dict[str, Any]
+    ) -> Property:
+        return await self._write_in_threadpool(
+            db, lambda sync_db: self.update(sync_db, db_obj=sync_db.get(Property, db_obj.id), obj_in=obj_in)
+        )
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> Property:
+        return await self._write_in_threadpool(db, lambda sync_db: self.remove(sync_db, id=id))
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> List[Property]:
@@ -55,8 +179,19 @@ class CRUDProperty(CRUDBase[Property, PropertyCreate, PropertyUpdate]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
+        db.flush()
+        catalog_version.bump(db)
+        PropertyMatcher.refresh_stored_matches(db, db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> Property:
+        obj = db.query(self.model).get(id)
+        catalog_version.bump(db)
+        PropertyMatcher.remove_stored_matches(db, id)
+        db.delete(obj)
+        db.commit()
+        return obj
+
 property = CRUDProperty(Property) 
\ No newline at end of file
@@ -0,0 +1,50 @@
+import base64
+import binascii
+import json
+from typing import Any, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    # None on the last page
+    next_cursor: Optional[str]
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque token for the page after the row with id `last_id`."""
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["after"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursor(cursor)
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursor(cursor)
+    return last_id
+
+
+def paginate(query: Query, model, cursor: Optional[str] = None, limit: int = 100) -> Page:
+    """
+    Keyset pagination over `model.id`.
+
+    Each page seeks past the previous page's last id through the primary key
+    index instead of scanning skipped rows, and rows inserted meanwhile never
+    shift later pages.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    if cursor:
+        query = query.filter(model.id > decode_cursor(cursor))
+    rows = query.order_by(model.id).limit(limit + 1).all()
+    if len(rows) > limit:
+        return Page(rows[:limit], encode_cursor(rows[limit - 1].id))
+    return Page(rows, None)
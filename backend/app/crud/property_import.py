@@ -0,0 +1,133 @@
+"""
+Bulk property import from CSV or NDJSON.
+
+The input is parsed as a stream and each record validated against
+PropertyCreate; valid rows are inserted IMPORT_BATCH_SIZE at a time, each
+batch in its own transaction, so a failed batch never undoes earlier ones.
+Report row numbers count records from 1: CSV data rows after the header,
+NDJSON lines (blank lines included).
+"""
+import csv
+import io
+import json
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.schemas.property import PropertyCreate, PropertyImportError, PropertyImportReport
+
+FORMATS = ("csv", "ndjson")
+
+_SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# (row number, record or None, error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    """The import format implied by a file name or content type, if any."""
+    if filename:
+        for suffix, fmt in _SUFFIXES.items():
+            if filename.lower().endswith(suffix):
+                return fmt
+    if content_type:
+        return _CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+    return None
+
+
+def _csv_records(text: IO[str]) -> Iterator[Record]:
+    reader = csv.DictReader(text)
+    row = 0
+    while True:
+        row += 1
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield row, None, f"malformed CSV: {exc}"
+            continue
+        # Empty cells fall back to the schema defaults; extra cells land under None
+        yield row, {key: value for key, value in values.items() if key is not None and value not in (None, "")}, None
+
+
+def _ndjson_records(text: IO[str]) -> Iterator[Record]:
+    for row, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield row, None, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "expected a JSON object"
+            continue
+        yield row, record, None
+
+
+def iter_records(stream: IO[bytes], fmt: str) -> Iterator[Record]:
+    """Parse records one at a time from a binary stream; undecodable bytes become U+FFFD."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        yield from (_csv_records if fmt == "csv" else _ndjson_records)(text)
+    finally:
+        # Leave the caller's stream open
+        text.detach()
+
+
+def validation_messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    ]
+
+
+def _insert_batch(
+    db: Session, batch: List[Tuple[int, PropertyCreate]], owner_id: int, errors: List[PropertyImportError]
+) -> int:
+    try:
+        return len(crud.property.create_many_with_owner(db, objs_in=[obj for _, obj in batch], owner_id=owner_id))
+    except SQLAlchemyError as exc:
+        db.rollback()
+        reason = f"batch not saved: {str(getattr(exc, 'orig', exc)).splitlines()[0]}"
+        errors.extend(PropertyImportError(row=row, errors=[reason]) for row, _ in batch)
+        return 0
+
+
+def import_properties(
+    db: Session, stream: IO[bytes], fmt: str, owner_id: int, batch_size: Optional[int] = None
+) -> PropertyImportReport:
+    """Import every valid record in `stream` as a listing of `owner_id` and report the rest."""
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    created = 0
+    errors: List[PropertyImportError] = []
+    batch: List[Tuple[int, PropertyCreate]] = []
+
+    for row, record, error in iter_records(stream, fmt):
+        if error is not None:
+            errors.append(PropertyImportError(row=row, errors=[error]))
+            continue
+        try:
+            batch.append((row, PropertyCreate.model_validate(record)))
+        except ValidationError as exc:
+            errors.append(PropertyImportError(row=row, errors=validation_messages(exc)))
+            continue
+        if len(batch) >= batch_size:
+            created += _insert_batch(db, batch, owner_id, errors)
+            batch = []
+    if batch:
+        created += _insert_batch(db, batch, owner_id, errors)
+
+    errors.sort(key=lambda error: error.row)
+    return PropertyImportReport(created=created, failed=len(errors), errors=errors)
@@ -5,6 +5,10 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.property import Property
 from app.models.exchange import Exchange
+from app.models.property_match import PropertyMatch, PropertyMatchStaging
+from app.models.chain_search_job import ChainSearchJob
+from app.models.catalog_version import CatalogVersion
+from app.models.match_store_build import MatchStoreBuild
 
 # Make them available for importing from this module
-__all__ = ["Base", "User", "Property", "Exchange"] 
\ No newline at end of file
+__all__ = ["Base", "User", "Property", "Exchange", "PropertyMatch", "PropertyMatchStaging", "ChainSearchJob", "CatalogVersion", "MatchStoreBuild"] 
\ No newline at end of file
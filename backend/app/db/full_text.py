@@ -0,0 +1,44 @@
+"""
+Full-text search over property address and description.
+
+The index is a generated `search_vector` tsvector column with a GIN index
+(added by migration, or by `install` under create_all). Search is Postgres
+only, like the rest of the schema. The column is deliberately not mapped, so
+ORM loads never fetch it.
+"""
+from sqlalchemy import func, literal_column
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Query
+
+SEARCH_CONFIG = "english"
+
+POSTGRES_DDL = [
+    f"""
+    ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(address, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_properties_search_vector ON properties USING gin (search_vector)",
+]
+
+
+def install(target, connection: Connection, **kw) -> None:
+    """after_create hook on the properties table."""
+    if connection.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.exec_driver_sql(statement)
+
+
+def search(query: Query, model, q: str) -> Query:
+    """
+    Restrict a query on properties to rows matching `q`, best match first.
+
+    Other filters on `query` are combined with the match in the same statement.
+    """
+    search_vector = literal_column(f"{model.__tablename__}.search_vector")
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    return query.filter(search_vector.op("@@")(ts_query)).order_by(
+        func.ts_rank_cd(search_vector, ts_query).desc(), model.id
+    )
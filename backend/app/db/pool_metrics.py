@@ -0,0 +1,87 @@
+"""
+Connection pool sizing from settings, and pool metrics under `<prefix>_*`.
+
+Checkout wait is timed inside the pool class itself, since pool events only
+fire once a connection has been handed out; everything else comes from
+pool events and the pool's own counters.
+"""
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+def timed_pool_class(base: Type[QueuePool], prefix: str) -> Type[QueuePool]:
+    """A `base` subclass that records how long each checkout waited for a connection."""
+    wait = registry.histogram(
+        f"{prefix}_checkout_wait_seconds", "Time spent waiting for a pooled connection, including timeouts"
+    )
+    timeouts = registry.counter(
+        f"{prefix}_checkout_timeouts_total", "Checkouts that gave up after the pool timeout"
+    )
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        except exc.TimeoutError:
+            timeouts.inc()
+            raise
+        finally:
+            wait.observe(time.perf_counter() - started)
+
+    # A class attribute, so pools recreated by Engine.dispose() stay timed
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def pool_options(url: str, base: Type[QueuePool], prefix: str) -> Dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments for the configured pool."""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    # In-memory SQLite lives in a single connection; there is nothing to size
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=timed_pool_class(base, prefix),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def instrument_engine(engine: Engine, prefix: str) -> None:
+    """Register pool gauges and connection churn counters for a (sync) engine."""
+    checkouts = registry.counter(f"{prefix}_checkouts_total", "Connections handed out by the pool")
+    opened = registry.counter(f"{prefix}_connections_opened_total", "New database connections opened")
+    closed = registry.counter(f"{prefix}_connections_closed_total", "Database connections closed")
+    invalidated = registry.counter(
+        f"{prefix}_connections_invalidated_total", "Connections discarded as stale, recycled or broken"
+    )
+
+    event.listen(engine, "checkout", lambda *args: checkouts.inc())
+    event.listen(engine, "connect", lambda *args: opened.inc())
+    event.listen(engine, "close", lambda *args: closed.inc())
+    event.listen(engine, "close_detached", lambda *args: closed.inc())
+    event.listen(engine, "invalidate", lambda *args: invalidated.inc())
+    event.listen(engine, "soft_invalidate", lambda *args: invalidated.inc())
+
+    if not isinstance(engine.pool, QueuePool):
+        return
+    # Read through the engine, which swaps in a fresh pool on dispose()
+    registry.gauge(f"{prefix}_size", "Configured pool size", lambda: engine.pool.size())
+    registry.gauge(f"{prefix}_checked_out", "Connections currently in use", lambda: engine.pool.checkedout())
+    registry.gauge(f"{prefix}_checked_in", "Idle connections in the pool", lambda: engine.pool.checkedin())
+    registry.gauge(
+        f"{prefix}_overflow", "Connections open beyond pool_size",
+        # QueuePool.overflow() counts down from -pool_size while the pool is still filling
+        lambda: max(0, engine.pool.overflow()),
+    )
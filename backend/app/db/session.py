@@ -1,7 +1,32 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.db.pool_metrics import instrument_engine, pool_options
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL, QueuePool, "db_pool"))
+instrument_engine(engine, "db_pool")
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def release_connection(db: Session) -> None:
+    """
+    End a read-only session's transaction so its connection goes back to the
+    pool, keeping loaded objects readable; the next query checks one out again.
+    """
+    expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **pool_options(settings.ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, "db_async_pool"),
+)
+instrument_engine(async_engine.sync_engine, "db_async_pool")
+# Objects stay readable after commit; lazy loads are not possible outside the session's greenlet
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
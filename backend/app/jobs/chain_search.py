@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.matching.property_matcher import PropertyMatcher
+from app.models.chain_search_job import ACTIVE_JOB_STATUSES, ChainSearchJob
+from app.models.property import Property
+
+logger = logging.getLogger(__name__)
+
+# Parameters that only affect best-first searches
+BEST_FIRST_PARAMS = ("top_k", "beam_width", "time_budget_ms")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.JOB_WORKERS, thread_name_prefix="chain-search"
+            )
+        return _executor
+
+
+def shutdown() -> None:
+    """Stop taking work; queued jobs stay queued in the table and resume on the next start."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop parameters the chosen mode ignores, so equivalent requests hash alike."""
+    if params.get("mode") == "best_first":
+        return dict(params)
+    return {key: value for key, value in params.items() if key not in BEST_FIRST_PARAMS}
+
+
+def request_hash(property_id: int, params: Dict[str, Any], created_by: Optional[int] = None) -> str:
+    payload = json.dumps({"property_id": property_id, "created_by": created_by, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_active_job(db: Session, digest: str) -> Optional[ChainSearchJob]:
+    return (
+        db.query(ChainSearchJob)
+        .filter(ChainSearchJob.request_hash == digest)
+        .filter(ChainSearchJob.status.in_(ACTIVE_JOB_STATUSES))
+        .first()
+    )
+
+
+def submit_chain_search(
+    db: Session, property_id: int, params: Dict[str, Any], created_by: Optional[int] = None
+) -> ChainSearchJob:
+    """Queue a chain search, or return the caller's queued or running job for the same request."""
+    params = normalize_params(params)
+    digest = request_hash(property_id, params, created_by)
+    job = get_active_job(db, digest)
+    if job is not None:
+        return job
+
+    job = ChainSearchJob(
+        id=uuid.uuid4().hex,
+        request_hash=digest,
+        property_id=property_id,
+        params=params,
+        status="queued",
+        progress=0.0,
+        created_by=created_by,
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request queued the same search first
+        db.rollback()
+        return get_active_job(db, digest)
+    db.refresh(job)
+    get_executor().submit(run_chain_search, job.id)
+    return job
+
+
+class LeaseLost(Exception):
+    """The job was requeued and claimed again, so this run's writes no longer land."""
+
+
+def _update(db: Session, job_id: str, lease_token: Optional[str] = None, **values) -> int:
+    query = db.query(ChainSearchJob).filter(ChainSearchJob.id == job_id)
+    if lease_token is not None:
+        query = query.filter(ChainSearchJob.lease_token == lease_token)
+    updated = query.update(values, synchronize_session=False)
+    db.commit()
+    return updated
+
+
+def _heartbeat(job_id: str, lease_token: str, stop: threading.Event, lost: threading.Event) -> None:
+    """Refresh the job's heartbeat until `stop` is set, or flag `lost` once the lease is gone."""
+    while not stop.wait(settings.JOB_HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            if not _update(db, job_id, lease_token, heartbeat_at=datetime.now(timezone.utc)):
+                lost.set()
+                return
+        except SQLAlchemyError:
+            # Try again on the next beat; the job only goes stale after many misses
+            logger.exception("Could not refresh the heartbeat of chain search job %s", job_id)
+        finally:
+            db.close()
+
+
+def run_chain_search(job_id: str) -> None:
+    """Run one queued job in a worker thread, with its own session."""
+    db = SessionLocal()
+    lease_token = uuid.uuid4().hex
+    stop, lost = threading.Event(), threading.Event()
+    try:
+        # Claim the job; a job already claimed elsewhere is left alone
+        now = datetime.now(timezone.utc)
+        claimed = (
+            db.query(ChainSearchJob)
+            .filter(ChainSearchJob.id == job_id, ChainSearchJob.status == "queued")
+            .update(
+                {
+                    "status": "running",
+                    "progress": 0.0,
+                    "started_at": now,
+                    "heartbeat_at": now,
+                    "lease_token": lease_token,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if not claimed:
+            return
+        threading.Thread(
+            target=_heartbeat, args=(job_id, lease_token, stop, lost), name=f"chain-search-heartbeat-{job_id[:8]}",
+            daemon=True,
+        ).start()
+
+        job = db.get(ChainSearchJob, job_id)
+        source_property = db.get(Property, job.property_id)
+        if source_property is None:
+            raise ValueError("Property not found")
+
+        def report(fraction: float) -> None:
+            if lost.is_set() or not _update(db, job_id, lease_token, progress=fraction):
+                raise LeaseLost()
+
+        chains, exhaustive = PropertyMatcher.find_exchange_chains(
+            db=db, source_property=source_property, progress=report, **job.params
+        )
+
+        _update(
+            db, job_id, lease_token,
+            status="succeeded",
+            progress=1.0,
+            result={
+                "exhaustive": exhaustive,
+                "chains": [[[prop.id, score] for prop, score in chain] for chain in chains],
+            },
+            finished_at=datetime.now(timezone.utc),
+        )
+    except LeaseLost:
+        logger.warning("Chain search job %s was claimed by another worker; dropping this run", job_id)
+        db.rollback()
+    except Exception as exc:
+        logger.exception("Chain search job %s failed", job_id)
+        db.rollback()
+        _update(db, job_id, lease_token, status="failed", error=str(exc), finished_at=datetime.now(timezone.utc))
+    finally:
+        stop.set()
+        db.close()
+
+
+def resume_jobs() -> int:
+    """
+    Requeue jobs interrupted by a restart: queued jobs, and running jobs
+    whose last heartbeat is older than JOB_STALE_AFTER_SECONDS. Requeuing
+    revokes the old lease, so a worker that was only slow stops writing.
+    Returns the number of jobs submitted.
+    """
+    db = SessionLocal()
+    try:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        db.query(ChainSearchJob).filter(
+            ChainSearchJob.status == "running",
+            or_(ChainSearchJob.heartbeat_at.is_(None), ChainSearchJob.heartbeat_at < stale_before),
+        ).update({"status": "queued", "lease_token": None}, synchronize_session=False)
+        db.commit()
+        job_ids = [job_id for job_id, in db.query(ChainSearchJob.id).filter(ChainSearchJob.status == "queued")]
+    except SQLAlchemyError:
+        logger.exception("Could not resume chain search jobs")
+        return 0
+    finally:
+        db.close()
+    for job_id in job_ids:
+        get_executor().submit(run_chain_search, job_id)
+    return len(job_ids)
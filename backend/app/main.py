@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
+from app.core import security
 from app.core.config import settings
+from app.core.metrics import registry
+from app.db.session import async_engine
+from app.jobs import chain_search as chain_search_jobs
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -18,10 +23,42 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Chain-Search-Exhaustive", "X-Next-Cursor"],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.exception_handler(security.PasswordHashingBusy)
+def password_hashing_busy(request: Request, exc: security.PasswordHashingBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-ins in progress, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.on_event("startup")
+def calibrate_password_hashing():
+    security.set_hash_rounds(
+        settings.PASSWORD_HASH_ROUNDS or security.calibrate_hash_rounds(settings.PASSWORD_HASH_TARGET_MS)
+    )
+
+@app.on_event("startup")
+def resume_background_jobs():
+    # Jobs queued or interrupted before a restart are picked up again
+    chain_search_jobs.resume_jobs()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    chain_search_jobs.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
-    return {"message": "Welcome to PropExchange API"} 
\ No newline at end of file
+    return {"message": "Welcome to PropExchange API"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,125 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.matching.scoring_engine import ScoringEngine
+
+# Band for listings without a usable price; they only score through location and type
+NO_PRICE_BAND = np.iinfo(np.int64).min
+
+BucketKey = Tuple[int, int, int]
+
+
+class BucketIndex:
+    """
+    Approximate candidate generation over a catalog snapshot.
+
+    Listings are hashed into buckets keyed by (type-compatibility class,
+    state, log-price band). A query scores its own bucket plus the `probes`
+    neighbouring buckets (other type classes and price bands in the same
+    state) with the highest score upper bound, so raising `probes` trades
+    latency for recall. Candidates in other states are never returned.
+    """
+
+    def __init__(self, engine: ScoringEngine, type_classes: Dict[int, int]):
+        """
+        `type_classes` maps property_type_code to a compatibility class; codes
+        missing from it form a class of their own.
+        """
+        self.engine = engine
+        # One band spans a factor of (1 + tolerance), so every priced match sits within two bands
+        self.band_width = math.log1p(engine.tolerance)
+
+        size = engine.type_matrix.shape[0]
+        other = max(type_classes.values(), default=-1) + 1
+        self.class_by_code = np.array([type_classes.get(code, other) for code in range(size)], dtype=np.int64)
+        self.codes_by_class: Dict[int, np.ndarray] = {
+            class_id: np.flatnonzero(self.class_by_code == class_id)
+            for class_id in np.unique(self.class_by_code).tolist()
+        }
+
+        classes = self.class_by_code[engine.type_codes]
+        bands = self.price_bands(engine.prices)
+        order = np.lexsort((bands, engine.state_codes, classes))
+        keys = np.stack((classes[order], engine.state_codes[order].astype(np.int64), bands[order]), axis=1)
+        starts = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1 if len(keys) else np.zeros(0, dtype=np.int64)
+        self.buckets: Dict[BucketKey, np.ndarray] = {
+            tuple(keys[start].tolist()): np.sort(rows)
+            for start, rows in zip(np.concatenate(([0], starts)).tolist(), np.split(order, starts))
+            if len(rows)
+        }
+        # Bucket coordinates as columns, so probe_order bounds every bucket in one pass
+        self.keys: List[BucketKey] = list(self.buckets)
+        coordinates = np.array(self.keys, dtype=np.int64).reshape(-1, 3)
+        self.key_classes, self.key_states, self.key_bands = coordinates.T
+        # The exact scorer awards a city match across states, so remember which states hold each city
+        self.states_by_city: Dict[int, np.ndarray] = {}
+        for city_code, state_code in set(zip(engine.city_codes.tolist(), engine.state_codes.tolist())):
+            self.states_by_city.setdefault(city_code, []).append(state_code)
+        self.states_by_city = {
+            city_code: np.array(states, dtype=np.int64) for city_code, states in self.states_by_city.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def price_bands(self, prices: np.ndarray) -> np.ndarray:
+        bands = np.full(len(prices), NO_PRICE_BAND, dtype=np.int64)
+        priced = prices > 0
+        bands[priced] = np.floor(np.log(prices[priced]) / self.band_width).astype(np.int64)
+        return bands
+
+    def value_bounds(self, offsets: np.ndarray) -> np.ndarray:
+        """Best value score for listings `offsets` price bands away from the source's band."""
+        # Closest possible price ratio to the source in each band
+        ratios = np.exp((np.abs(offsets) - 1) * self.band_width)
+        gaps = np.where(offsets > 0, ratios - 1, 1 - 1 / ratios)
+        bounds = np.maximum(0.0, 1.0 - gaps / self.engine.tolerance)
+        return np.where(offsets == 0, 1.0, bounds)
+
+    def probe_order(
+        self, price: float, city_code: int, state_code: int, type_code: int, min_score: float
+    ) -> List[BucketKey]:
+        """Every bucket by descending score upper bound, skipping any below `min_score`."""
+        weights = self.engine.weights
+        band = int(self.price_bands(np.array([price], dtype=np.float64))[0])
+
+        priced = (self.key_bands != NO_PRICE_BAND) & (band != NO_PRICE_BAND)
+        offsets = np.where(priced, self.key_bands - band, 0)
+        # Bands far from the source saturate at zero; clipping keeps exp() finite
+        value_bounds = np.where(priced, self.value_bounds(np.clip(offsets, -64, 64)), 0.0)
+
+        # Own state may hold the exact location, a state sharing the city name a city match
+        location_bounds = np.full(len(self.keys), 0.2)
+        location_bounds[np.isin(self.key_states, self.states_by_city.get(city_code, []))] = 0.8
+        location_bounds[self.key_states == state_code] = 1.0
+
+        type_bounds = np.zeros(int(self.class_by_code.max()) + 1)
+        for class_id, codes in self.codes_by_class.items():
+            type_bounds[class_id] = self.engine.type_matrix[type_code, codes].max()
+
+        bounds = (
+            value_bounds * weights['value']
+            + location_bounds * weights['location']
+            + type_bounds[self.key_classes] * weights['type']
+        )
+        eligible = np.flatnonzero(bounds >= min_score - 1e-9)
+        ranked = eligible[np.lexsort((
+            self.key_bands[eligible],
+            self.key_states[eligible],
+            self.key_classes[eligible],
+            np.abs(offsets[eligible]),
+            -bounds[eligible],
+        ))]
+        return [self.keys[position] for position in ranked.tolist()]
+
+    def candidates(
+        self, price: float, city_code: int, state_code: int, type_code: int, min_score: float, probes: int
+    ) -> np.ndarray:
+        """Catalog rows, in catalog order, from the source's best bucket and `probes` neighbours."""
+        keys = self.probe_order(np.nan if price is None else price, city_code, state_code, type_code, min_score)
+        found = [self.buckets[key] for key in keys[:probes + 1]]
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(found))
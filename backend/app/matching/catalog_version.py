@@ -0,0 +1,25 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.catalog_version import CatalogVersion
+
+# The counter lives in a single row
+ROW_ID = 1
+
+
+def current(db: Session) -> int:
+    """The catalog version visible to this session's transaction."""
+    version = db.query(CatalogVersion.version).filter(CatalogVersion.id == ROW_ID).scalar()
+    return version or 0
+
+
+def bump(db: Session) -> None:
+    """Advance the version as part of the caller's transaction, so it commits with the write."""
+    updated = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == ROW_ID)
+        .values(version=CatalogVersion.version + 1)
+    ).rowcount
+    if not updated:
+        db.add(CatalogVersion(id=ROW_ID, version=1))
+        db.flush()
@@ -0,0 +1,145 @@
+import heapq
+import itertools
+import time
+from typing import Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from app.matching.match_graph import MatchGraph
+
+Chain = List[Tuple[int, float]]
+
+
+class ChainSearchResult(NamedTuple):
+    chains: List[Chain]
+    # False when the beam or the time budget cut the search short
+    exhaustive: bool
+
+
+class _PartialChain:
+    """Chain prefix stored as a parent-linked list, so extending it never copies."""
+
+    __slots__ = ("node_id", "score", "length", "total", "parent")
+
+    def __init__(self, node_id: int, score: float, length: int, total: float, parent: Optional["_PartialChain"]):
+        self.node_id = node_id
+        self.score = score
+        self.length = length
+        self.total = total
+        self.parent = parent
+
+    def contains(self, node_id: int) -> bool:
+        entry = self
+        while entry is not None:
+            if entry.node_id == node_id:
+                return True
+            entry = entry.parent
+        return False
+
+    def to_chain(self) -> Chain:
+        chain = []
+        entry = self
+        # The root is the source property, which is not part of the chain
+        while entry.parent is not None:
+            chain.append((entry.node_id, entry.score))
+            entry = entry.parent
+        chain.reverse()
+        return chain
+
+
+def depth_first_chains(graph: MatchGraph, source_id: int, max_chain_length: int) -> Iterator[Chain]:
+    """
+    Yield chains from the source in depth-first discovery order, unsorted.
+
+    Nothing but the current path is held, so chains can be consumed as they
+    are found.
+    """
+    if max_chain_length < 1:
+        raise ValueError("max_chain_length must be at least 1")
+
+    def walk(node_id: int, chain: Chain, visited: Set[int]) -> Iterator[Chain]:
+        if len(chain) >= max_chain_length:
+            yield chain
+            return
+        for match_id, match_score in graph.neighbours(node_id):
+            if match_id not in visited:
+                extended = chain + [(match_id, match_score)]
+                # Only chains with at least 2 properties
+                if len(extended) > 1:
+                    yield extended
+                yield from walk(match_id, extended, visited | {match_id})
+
+    return walk(source_id, [], {source_id})
+
+
+def best_first_chains(
+    graph: MatchGraph,
+    source_id: int,
+    max_chain_length: int,
+    top_k: int,
+    beam_width: Optional[int] = None,
+    time_budget_ms: Optional[int] = None,
+    max_edge_score: float = 1.0,
+) -> ChainSearchResult:
+    """
+    Return the `top_k` chains with the highest average score, best first.
+
+    Partial chains are expanded in order of an upper bound on the average
+    any extension can still reach. Once the best remaining bound cannot beat
+    the current k-th result, the search stops. `beam_width` caps the frontier
+    at that many partial chains after every expansion and `time_budget_ms`
+    caps wall time; hitting either marks the result as not exhaustive.
+    """
+    if max_chain_length < 1:
+        raise ValueError("max_chain_length must be at least 1")
+    deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+    min_length = min(2, max_chain_length)
+    counter = itertools.count()
+
+    def upper_bound(entry: _PartialChain) -> float:
+        # Stopping now vs. extending to full length with perfect edges
+        remaining = max_chain_length - entry.length
+        best_extended = (entry.total + remaining * max_edge_score) / max_chain_length
+        return max(entry.total / entry.length, best_extended) if entry.length else best_extended
+
+    # Min-heap of (average, order, entry) holding the current top_k results
+    results: List[Tuple[float, int, _PartialChain]] = []
+    root = _PartialChain(source_id, 0.0, 0, 0.0, None)
+    frontier = [(-upper_bound(root), next(counter), root)]
+    exhaustive = True
+
+    while frontier and top_k > 0:
+        if deadline is not None and time.monotonic() >= deadline:
+            exhaustive = False
+            break
+
+        neg_bound, _, entry = heapq.heappop(frontier)
+        if len(results) >= top_k and -neg_bound <= results[0][0]:
+            break
+
+        for match_id, match_score in graph.neighbours(entry.node_id):
+            if entry.contains(match_id):
+                continue
+            child = _PartialChain(match_id, match_score, entry.length + 1, entry.total + match_score, entry)
+
+            if child.length >= min_length:
+                average = child.total / child.length
+                if len(results) < top_k:
+                    heapq.heappush(results, (average, -next(counter), child))
+                elif average > results[0][0]:
+                    heapq.heapreplace(results, (average, -next(counter), child))
+
+            if child.length < max_chain_length:
+                bound = upper_bound(child)
+                if len(results) < top_k or bound > results[0][0]:
+                    heapq.heappush(frontier, (-bound, next(counter), child))
+
+        # Trim the frontier to the most promising partial chains
+        if beam_width is not None and len(frontier) > beam_width:
+            kept = heapq.nsmallest(beam_width + 1, frontier)
+            best_dropped_bound = -kept.pop()[0]
+            if len(results) < top_k or best_dropped_bound > results[0][0]:
+                exhaustive = False
+            frontier = kept
+            heapq.heapify(frontier)
+
+    ranked = sorted(results, key=lambda item: (-item[0], -item[1]))
+    return ChainSearchResult([entry.to_chain() for _, _, entry in ranked], exhaustive)
@@ -0,0 +1,195 @@
+import argparse
+import json
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix, identity
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+from sqlalchemy.orm import Session, aliased
+
+from app.db import base  # noqa: F401
+from app.db.session import SessionLocal
+from app.matching import match_store
+from app.matching.property_matcher import PropertyMatcher
+from app.matching.ring_search import Ring
+from app.models.property import Property
+from app.models.property_match import PropertyMatch
+
+
+class ClearingResult(NamedTuple):
+    # Each deal is a ring: every owner receives the next property, the last closes the loop
+    deals: List[Ring]
+    total_score: float
+    properties_matched: int
+    # Cycles the solver chose that hand one owner two properties; not counted in the totals
+    rejected: List[Ring]
+
+
+def build_score_matrix(
+    db: Session,
+    min_score: float = 0.6,
+    max_edges_per_source: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, csr_matrix]:
+    """
+    Ids and owner ids of available properties, and the sparse matrix of
+    match scores between them (owner -1 stands for no owner).
+
+    Entry (i, j) is the score of property j as a replacement for property i.
+    Rows come from property_matches when it covers `min_score`, otherwise
+    each row is scored in one vectorized pass.
+    """
+    if match_store.covers(db, min_score):
+        available = (
+            db.query(Property.id, Property.owner_id)
+            .filter(Property.status == "available")
+            .order_by(Property.id)
+            .all()
+        )
+        ids = np.array([prop_id for prop_id, _ in available], dtype=np.int64)
+        owner_ids = np.array([-1 if owner_id is None else owner_id for _, owner_id in available], dtype=np.int64)
+        source = aliased(Property)
+        edges = np.array(
+            db.query(PropertyMatch.source_id, PropertyMatch.target_id, PropertyMatch.score)
+            .join(source, source.id == PropertyMatch.source_id)
+            .join(Property, Property.id == PropertyMatch.target_id)
+            .filter(source.status == "available")
+            .filter(Property.status == "available")
+            .filter(PropertyMatch.score >= min_score)
+            .all(),
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        rows = np.searchsorted(ids, edges[:, 0].astype(np.int64))
+        cols = np.searchsorted(ids, edges[:, 1].astype(np.int64))
+        scores = edges[:, 2]
+        if max_edges_per_source is not None:
+            rows, cols, scores = _cap_per_row(rows, cols, scores, max_edges_per_source)
+    else:
+        engine = PropertyMatcher.build_engine(PropertyMatcher.candidate_columns(db).all())
+        ids, owner_ids = engine.ids, engine.owner_ids
+        row_parts, col_parts, score_parts = [], [], []
+        for row in range(len(engine)):
+            owner_id = int(engine.owner_ids[row])
+            candidates, candidate_scores = engine.top_k(
+                engine.score_row(row),
+                min_score,
+                len(engine) if max_edges_per_source is None else max_edges_per_source,
+                mask=engine.candidate_mask(int(ids[row]), owner_id if owner_id >= 0 else None),
+            )
+            row_parts.append(np.full(len(candidates), row))
+            col_parts.append(candidates)
+            score_parts.append(candidate_scores)
+        rows = np.concatenate(row_parts) if row_parts else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(col_parts) if col_parts else np.zeros(0, dtype=np.int64)
+        scores = np.concatenate(score_parts) if score_parts else np.zeros(0)
+
+    return ids, owner_ids, csr_matrix((scores, (rows, cols)), shape=(len(ids), len(ids)))
+
+
+def _cap_per_row(
+    rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, cap: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Keep each row's `cap` best-scoring entries."""
+    order = np.lexsort((-scores, rows))
+    rows, cols, scores = rows[order], cols[order], scores[order]
+    row_starts = np.searchsorted(rows, rows)
+    keep = np.arange(len(rows)) - row_starts < cap
+    return rows[keep], cols[keep], scores[keep]
+
+
+def clear_market(ids: np.ndarray, owner_ids: np.ndarray, scores: csr_matrix) -> ClearingResult:
+    """
+    Pick non-conflicting exchanges maximizing the total match score.
+
+    Every property gives its listing to at most one owner and receives at
+    most one listing, i.e. a maximum-weight cycle cover. It is solved as a
+    minimum-cost perfect bipartite matching (LAPJVsp) on the sparse matrix,
+    where a zero-score diagonal lets a property stay out of any deal.
+
+    The cover is over properties, not owners, so a cycle may pass through
+    two properties of the same owner. Rings need distinct owners, as in
+    ring_search, so such cycles are rejected after solving: they are
+    returned in `rejected` and left out of the deals and totals. The
+    remaining deals are still non-conflicting, but no longer guaranteed to
+    be the best owner-distinct selection.
+    """
+    n = len(ids)
+    if n == 0:
+        return ClearingResult([], 0.0, 0, [])
+
+    # Maximizing the score of n assignments == minimizing (2 - score); all costs stay positive
+    costs = scores.copy()
+    costs.data = 2.0 - costs.data
+    costs = (costs + identity(n, format="csr") * 2.0).tocsr()
+    receivers, given = min_weight_full_bipartite_matching(costs)
+    assignment = np.empty(n, dtype=np.int64)
+    assignment[receivers] = given
+
+    deals: List[Ring] = []
+    rejected: List[Ring] = []
+    seen = np.zeros(n, dtype=bool)
+    for start in range(n):
+        if seen[start] or assignment[start] == start:
+            continue
+        deal = []
+        owners = set()
+        node = start
+        while not seen[node]:
+            seen[node] = True
+            owners.add(int(owner_ids[node]))
+            received = assignment[node]
+            deal.append((int(ids[received]), float(scores[node, received])))
+            node = received
+        (deals if len(owners) == len(deal) else rejected).append(deal)
+
+    deals.sort(key=lambda deal: sum(score for _, score in deal), reverse=True)
+    return ClearingResult(
+        deals,
+        sum(score for deal in deals for _, score in deal),
+        sum(len(deal) for deal in deals),
+        rejected,
+    )
+
+
+def run_market_clearing(
+    db: Session,
+    min_score: float = 0.6,
+    max_edges_per_source: Optional[int] = None
+) -> ClearingResult:
+    ids, owner_ids, scores = build_score_matrix(db, min_score, max_edges_per_source)
+    return clear_market(ids, owner_ids, scores)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Propose non-conflicting exchanges across the available catalog.")
+    parser.add_argument("--min-score", type=float, default=0.6)
+    parser.add_argument("--max-edges-per-source", type=int, default=None)
+    parser.add_argument("--output", help="Write proposals as JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = run_market_clearing(db, args.min_score, args.max_edges_per_source)
+    finally:
+        db.close()
+
+    report = json.dumps({
+        "total_score": result.total_score,
+        "properties_matched": result.properties_matched,
+        "deals": [
+            [{"property_id": prop_id, "match_score": score} for prop_id, score in deal]
+            for deal in result.deals
+        ],
+        "rejected": [
+            [{"property_id": prop_id, "match_score": score} for prop_id, score in deal]
+            for deal in result.rejected
+        ],
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
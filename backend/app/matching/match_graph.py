@@ -0,0 +1,92 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.matching.scoring_engine import ScoringEngine
+
+Neighbours = List[Tuple[int, float]]
+
+
+class MatchGraph:
+    """
+    Memoized adjacency of property id -> scored neighbours, sorted best first.
+
+    Neighbour lists are computed lazily, once per distinct node, by a loader
+    that receives every id still missing from the graph.
+    """
+
+    def __init__(self, loader: Callable[[List[int]], Dict[int, Neighbours]]):
+        self._loader = loader
+        self._adjacency: Dict[int, Neighbours] = {}
+
+    @classmethod
+    def from_engine(
+        cls,
+        engine: ScoringEngine,
+        min_score: float,
+        limit: int,
+    ) -> "MatchGraph":
+        """Build a graph whose edges are scored in memory against a catalog snapshot."""
+        def load(node_ids: List[int]) -> Dict[int, Neighbours]:
+            adjacency = {}
+            for node_id in node_ids:
+                row = engine.row_by_id.get(node_id)
+                if row is None:
+                    adjacency[node_id] = []
+                    continue
+                owner_id = int(engine.owner_ids[row])
+                rows, scores = engine.top_k(
+                    engine.score_row(row),
+                    min_score,
+                    limit,
+                    mask=engine.candidate_mask(node_id, owner_id if owner_id >= 0 else None),
+                )
+                adjacency[node_id] = list(zip(engine.ids[rows].tolist(), scores.tolist()))
+            return adjacency
+
+        return cls(load)
+
+    def add_node(self, node_id: int, neighbours: Neighbours) -> None:
+        """Register a node whose neighbours were scored outside the graph (e.g. the search source)."""
+        self._adjacency[node_id] = neighbours
+
+    def load(self, node_ids: Iterable[int]) -> None:
+        """Compute neighbours for every id not already in the graph, in one loader call."""
+        missing = [node_id for node_id in dict.fromkeys(node_ids) if node_id not in self._adjacency]
+        if missing:
+            self._adjacency.update(self._loader(missing))
+
+    def prefetch(
+        self, root_id: int, depth: int, on_level: Optional[Callable[[int], None]] = None
+    ) -> None:
+        """
+        Load every node within `depth` hops of the root, one loader call per
+        level. `on_level` is called with each level number once it is loaded.
+        """
+        frontier = [root_id]
+        for level in range(depth + 1):
+            self.load(frontier)
+            if on_level is not None:
+                on_level(level)
+            frontier = [
+                neighbour_id
+                for node_id in frontier
+                for neighbour_id, _ in self._adjacency[node_id]
+                if neighbour_id not in self._adjacency
+            ]
+            if not frontier:
+                break
+
+    def neighbours(self, node_id: int) -> Neighbours:
+        if node_id not in self._adjacency:
+            self.load([node_id])
+        return self._adjacency[node_id]
+
+    @property
+    def adjacency(self) -> Dict[int, Neighbours]:
+        """Every neighbour list loaded so far. Callers must not mutate it."""
+        return self._adjacency
+
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self._adjacency
+
+    def __len__(self) -> int:
+        return len(self._adjacency)
@@ -0,0 +1,250 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.matching.match_graph import Neighbours
+from app.matching.scoring_engine import ScoringEngine
+from app.models.match_store_build import MatchStoreBuild
+from app.models.property import Property
+from app.models.property_match import PropertyMatch, PropertyMatchStaging
+
+# Keep IN lists and executemany batches to a reasonable size
+BATCH_SIZE = 1000
+
+# The build marker lives in a single row
+BUILD_ROW_ID = 1
+
+
+def built_min_score(db: Session) -> Optional[float]:
+    """The threshold of the last completed build, or None while the table has never been filled."""
+    return db.query(MatchStoreBuild.min_score).filter(MatchStoreBuild.id == BUILD_ROW_ID).scalar()
+
+
+def mark_built(db: Session, min_score: float) -> None:
+    """Record a completed build as part of the caller's transaction, so it commits with the pairs."""
+    updated = db.execute(
+        update(MatchStoreBuild)
+        .where(MatchStoreBuild.id == BUILD_ROW_ID)
+        .values(min_score=min_score, built_at=func.now())
+    ).rowcount
+    if not updated:
+        db.add(MatchStoreBuild(id=BUILD_ROW_ID, min_score=min_score))
+        db.flush()
+
+
+def covers(db: Session, min_score: float) -> bool:
+    """
+    Whether the stored matches contain every pair scoring at least `min_score`.
+
+    False until a build has completed, so a freshly migrated empty table is
+    never served in place of live scoring.
+    """
+    if not settings.MATCH_STORE_ENABLED or min_score < settings.MATCH_STORE_MIN_SCORE:
+        return False
+    built = built_min_score(db)
+    return built is not None and min_score >= built
+
+
+def build_records(
+    source_ids: np.ndarray,
+    target_ids: np.ndarray,
+    value: np.ndarray,
+    location: np.ndarray,
+    type_: np.ndarray,
+    scores: np.ndarray,
+) -> List[Dict]:
+    return [
+        {
+            "source_id": source_id,
+            "target_id": target_id,
+            "score": score,
+            "components": {"value": v, "location": l, "type": t},
+        }
+        for source_id, target_id, v, l, t, score in zip(
+            source_ids.tolist(), target_ids.tolist(),
+            value.tolist(), location.tolist(), type_.tolist(), scores.tolist(),
+        )
+    ]
+
+
+def insert_records(db: Session, records: List[Dict], model=PropertyMatch) -> None:
+    for start in range(0, len(records), BATCH_SIZE):
+        db.execute(insert(model), records[start:start + BATCH_SIZE])
+
+
+def source_records(
+    engine: ScoringEngine, available: np.ndarray, row: int, min_score: float
+) -> List[Dict]:
+    """Stored rows for a catalog row as the source, against available targets."""
+    owner_id = int(engine.owner_ids[row])
+    mask = engine.candidate_mask(int(engine.ids[row]), owner_id if owner_id >= 0 else None) & available
+    value, location, type_ = engine.row_components(row)
+    scores = engine.combine(value, location, type_)
+    keep = np.flatnonzero(mask & (scores >= min_score))
+    return build_records(
+        np.full(len(keep), engine.ids[row]), engine.ids[keep],
+        value[keep], location[keep], type_[keep], scores[keep],
+    )
+
+
+def target_records(
+    engine: ScoringEngine, row: int, min_score: float, skip_sources: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Stored rows for every catalog property as the source, against a catalog
+    row as target. Rows flagged in `skip_sources` are left out as sources.
+    """
+    owner_id = int(engine.owner_ids[row])
+    mask = engine.candidate_mask(int(engine.ids[row]), owner_id if owner_id >= 0 else None)
+    if skip_sources is not None:
+        mask &= ~skip_sources
+    value, location, type_ = engine.reverse_row_components(row)
+    scores = engine.combine(value, location, type_)
+    keep = np.flatnonzero(mask & (scores >= min_score))
+    return build_records(
+        engine.ids[keep], np.full(len(keep), engine.ids[row]),
+        value[keep], location[keep], type_[keep], scores[keep],
+    )
+
+
+def delete_matches(db: Session, property_id: int) -> None:
+    """Drop every stored pair involving the property, in either direction."""
+    db.execute(
+        delete(PropertyMatch).where(
+            or_(PropertyMatch.source_id == property_id, PropertyMatch.target_id == property_id)
+        )
+    )
+
+
+def replace_matches(
+    db: Session,
+    engine: ScoringEngine,
+    available: np.ndarray,
+    property_id: int,
+    min_score: float,
+) -> None:
+    """Rescore one property against the catalog in both directions and store the result."""
+    delete_matches(db, property_id)
+    row = engine.row_by_id.get(property_id)
+    if row is None:
+        return
+    records = source_records(engine, available, row, min_score)
+    # Only available properties are offered to other sources
+    if available[row]:
+        records += target_records(engine, row, min_score)
+    insert_records(db, records)
+
+
+def add_matches(
+    db: Session,
+    engine: ScoringEngine,
+    available: np.ndarray,
+    property_ids: List[int],
+    min_score: float,
+) -> None:
+    """
+    Score freshly inserted properties, which have nothing stored yet, in both
+    directions. Pairs between two of them are written once, as source rows.
+    """
+    rows = [engine.row_by_id[property_id] for property_id in property_ids if property_id in engine.row_by_id]
+    inserted = np.zeros(len(engine), dtype=bool)
+    inserted[rows] = True
+    pending: List[Dict] = []
+    for row in rows:
+        pending += source_records(engine, available, row, min_score)
+        if available[row]:
+            pending += target_records(engine, row, min_score, skip_sources=inserted)
+        if len(pending) >= BATCH_SIZE:
+            insert_records(db, pending)
+            pending = []
+    insert_records(db, pending)
+
+
+def rebuild(
+    db: Session, engine: ScoringEngine, available: np.ndarray, min_score: float
+) -> int:
+    """Replace the whole table by scoring every property against the catalog, and mark it built."""
+    db.execute(delete(PropertyMatch))
+    written = 0
+    pending: List[Dict] = []
+    for row in range(len(engine)):
+        pending += source_records(engine, available, row, min_score)
+        if len(pending) >= BATCH_SIZE:
+            insert_records(db, pending)
+            written += len(pending)
+            pending = []
+    insert_records(db, pending)
+    mark_built(db, min_score)
+    return written + len(pending)
+
+
+def swap_in_staged(db: Session, min_score: float) -> None:
+    """
+    Replace the table with the pairs in property_matches_staging, skipping
+    properties deleted since they were staged, and mark it built. Readers
+    see the old pairs until the caller commits.
+    """
+    staged = PropertyMatchStaging
+    db.execute(delete(PropertyMatch))
+    db.execute(
+        insert(PropertyMatch).from_select(
+            ["source_id", "target_id", "score", "components"],
+            select(staged.source_id, staged.target_id, staged.score, staged.components)
+            .where(staged.source_id.in_(select(Property.id)))
+            .where(staged.target_id.in_(select(Property.id))),
+        )
+    )
+    mark_built(db, min_score)
+
+
+def find_matches(
+    db: Session, source_id: int, min_score: float, limit: int
+) -> List[Tuple[Property, float]]:
+    """Indexed lookup of a source's best stored matches."""
+    rows = (
+        db.query(Property, PropertyMatch.score)
+        .join(PropertyMatch, PropertyMatch.target_id == Property.id)
+        .filter(PropertyMatch.source_id == source_id)
+        .filter(PropertyMatch.score >= min_score)
+        .filter(Property.status == "available")
+        .order_by(PropertyMatch.score.desc(), PropertyMatch.target_id)
+        .limit(limit)
+        .all()
+    )
+    return [(prop, score) for prop, score in rows]
+
+
+def graph_loader(db: Session, min_score: float, limit: int):
+    """MatchGraph loader reading the top `limit` stored neighbours of many nodes per query."""
+    def load(node_ids: List[int]) -> Dict[int, Neighbours]:
+        adjacency: Dict[int, Neighbours] = {node_id: [] for node_id in node_ids}
+        for start in range(0, len(node_ids), BATCH_SIZE):
+            ranked = (
+                select(
+                    PropertyMatch.source_id,
+                    PropertyMatch.target_id,
+                    PropertyMatch.score,
+                    func.row_number().over(
+                        partition_by=PropertyMatch.source_id,
+                        order_by=(PropertyMatch.score.desc(), PropertyMatch.target_id),
+                    ).label("rank"),
+                )
+                .join(Property, Property.id == PropertyMatch.target_id)
+                .where(PropertyMatch.source_id.in_(node_ids[start:start + BATCH_SIZE]))
+                .where(PropertyMatch.score >= min_score)
+                .where(Property.status == "available")
+                .subquery()
+            )
+            rows = db.execute(
+                select(ranked.c.source_id, ranked.c.target_id, ranked.c.score)
+                .where(ranked.c.rank <= limit)
+                .order_by(ranked.c.source_id, ranked.c.rank)
+            )
+            for source_id, target_id, score in rows:
+                adjacency[source_id].append((target_id, score))
+        return adjacency
+
+    return load
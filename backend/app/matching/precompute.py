@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import base  # noqa: F401
+from app.db.session import SessionLocal
+from app.matching import catalog_version, match_store
+from app.matching.property_matcher import PropertyMatcher
+from app.matching.scoring_engine import ScoringEngine
+from app.models.property_match import PropertyMatchStaging
+
+BlockPair = Tuple[int, int]
+
+# Per-process state installed once by the pool initializer
+_engine: Optional[ScoringEngine] = None
+_available: Optional[np.ndarray] = None
+
+
+def _init_worker(engine: ScoringEngine, available: np.ndarray) -> None:
+    global _engine, _available
+    _engine = engine
+    _available = available
+
+
+def score_block_pair(
+    source_block: slice, target_block: slice, threshold: float
+) -> Dict[str, np.ndarray]:
+    """
+    Score one block of sources against one block of targets and keep the
+    pairs at or above `threshold`, with the same exclusions as the store.
+    """
+    engine, available = _engine, _available
+    source_rows = np.arange(len(engine))[source_block]
+    value, location, type_ = engine.components_many(*engine.row_sources(source_rows), targets=target_block)
+    scores = engine.combine(value, location, type_)
+
+    source_owners = engine.owner_ids[source_block][:, None]
+    target_owners = engine.owner_ids[target_block]
+    eligible = (
+        (scores >= threshold)
+        & available[target_block]
+        & (engine.ids[source_block][:, None] != engine.ids[target_block])
+        & (source_owners != target_owners)
+        & (source_owners >= 0)
+        & (target_owners >= 0)
+    )
+    rows, cols = np.nonzero(eligible)
+    return {
+        "source_id": engine.ids[source_block][rows],
+        "target_id": engine.ids[target_block][cols],
+        "score": scores[rows, cols],
+        "value": value[rows, cols],
+        "location": location[rows, cols],
+        "type": type_[rows, cols],
+    }
+
+
+def fingerprint(rows: List[Tuple], threshold: float, block_size: int) -> str:
+    """
+    Identify a run by the catalog's contents and the parameters, so a
+    checkpoint is never resumed against a changed catalog or partitioning.
+    """
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update(repr(tuple(row)).encode())
+    digest.update(json.dumps([threshold, block_size]).encode())
+    return digest.hexdigest()
+
+
+def row_digests(rows: List[Tuple]) -> np.ndarray:
+    """Stable per-row digests; unlike hash(), they do not change with the process's hash seed."""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(repr(tuple(row)).encode(), digest_size=8).digest(), "little", signed=True)
+        for row in rows
+    ], dtype=np.int64)
+
+
+def block_pairs(size: int, block_size: int) -> Iterator[Tuple[BlockPair, slice, slice]]:
+    blocks = [slice(start, min(start + block_size, size)) for start in range(0, size, block_size)]
+    for i, source_block in enumerate(blocks):
+        for j, target_block in enumerate(blocks):
+            yield (i, j), source_block, target_block
+
+
+class NpzSink:
+    """Writes each block pair to its own compressed file; existing files are the checkpoint."""
+
+    def __init__(self, directory: str, run_id: str, ids: np.ndarray, resume: bool):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, "manifest.json")
+        if resume and os.path.exists(manifest_path):
+            with open(manifest_path) as manifest:
+                if json.load(manifest)["run_id"] != run_id:
+                    raise SystemExit("Catalog or parameters changed since the checkpoint; rerun without --resume")
+        else:
+            for name in os.listdir(directory):
+                if name.startswith("part-"):
+                    os.remove(os.path.join(directory, name))
+            np.save(os.path.join(directory, "ids.npy"), ids)
+            with open(manifest_path, "w") as manifest:
+                json.dump({"run_id": run_id}, manifest)
+
+    def _path(self, pair: BlockPair) -> str:
+        return os.path.join(self.directory, f"part-{pair[0]:05d}-{pair[1]:05d}.npz")
+
+    def completed(self) -> Set[BlockPair]:
+        return {
+            (int(name[5:10]), int(name[11:16]))
+            for name in os.listdir(self.directory)
+            if name.startswith("part-") and name.endswith(".npz")
+        }
+
+    def write(self, pair: BlockPair, result: Dict[str, np.ndarray]) -> None:
+        tmp_path = self._path(pair) + ".tmp"
+        with open(tmp_path, "wb") as part:
+            np.savez_compressed(part, **result)
+        os.replace(tmp_path, self._path(pair))
+
+    def close(self) -> None:
+        pass
+
+
+class DatabaseSink:
+    """
+    Streams pairs into property_matches_staging, with completed block pairs
+    in a checkpoint file, and swaps the staged pairs into property_matches
+    in one transaction once every block pair is done. Live matching keeps
+    serving the previous build until then.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        checkpoint_path: str,
+        run_id: str,
+        resume: bool,
+        rows: List[Tuple],
+        threshold: float,
+        block_size: int,
+    ):
+        self.db = db
+        self.checkpoint_path = checkpoint_path
+        self.threshold = threshold
+        self.block_size = block_size
+        # Catalog rows are in id order, so every block covers an id range
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.digests = row_digests(rows)
+        if resume and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint:
+                if checkpoint.readline().strip() != run_id:
+                    raise SystemExit("Catalog or parameters changed since the checkpoint; rerun without --resume")
+        else:
+            db.execute(delete(PropertyMatchStaging))
+            db.commit()
+            with open(checkpoint_path, "w") as checkpoint:
+                checkpoint.write(f"{run_id}\n")
+
+    def completed(self) -> Set[BlockPair]:
+        with open(self.checkpoint_path) as checkpoint:
+            checkpoint.readline()
+            return {tuple(map(int, line.split())) for line in checkpoint if line.strip()}
+
+    def _id_range(self, block: int) -> Tuple[int, int]:
+        start = block * self.block_size
+        return int(self.ids[start]), int(self.ids[min(start + self.block_size, len(self.ids)) - 1])
+
+    def write(self, pair: BlockPair, result: Dict[str, np.ndarray]) -> None:
+        records = match_store.build_records(
+            result["source_id"], result["target_id"],
+            result["value"], result["location"], result["type"], result["score"],
+        )
+        # A crash after the commit but before the checkpoint append leaves the
+        # block pair staged; clearing it first makes writing it again safe
+        self.db.execute(
+            delete(PropertyMatchStaging)
+            .where(PropertyMatchStaging.source_id.between(*self._id_range(pair[0])))
+            .where(PropertyMatchStaging.target_id.between(*self._id_range(pair[1])))
+        )
+        match_store.insert_records(self.db, records, model=PropertyMatchStaging)
+        self.db.commit()
+        with open(self.checkpoint_path, "a") as checkpoint:
+            checkpoint.write(f"{pair[0]} {pair[1]}\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+
+    def changed_ids(self, rows: List[Tuple]) -> List[int]:
+        """Ids of properties created or updated since the snapshot the build was scored from."""
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        digests = row_digests(rows)
+        positions = np.minimum(np.searchsorted(self.ids, ids), max(len(self.ids) - 1, 0))
+        if len(self.ids):
+            unchanged = (self.ids[positions] == ids) & (self.digests[positions] == digests)
+        else:
+            unchanged = np.zeros(len(ids), dtype=bool)
+        return ids[~unchanged].tolist()
+
+    def close(self) -> None:
+        db = self.db
+        try:
+            # Holds off property writes until the swap commits
+            catalog_version.bump(db)
+            match_store.swap_in_staged(db, self.threshold)
+            # Rescore properties written during the run against the current catalog
+            rows = PropertyMatcher.catalog_rows(db)
+            changed = self.changed_ids(rows)
+            if changed:
+                engine, available = PropertyMatcher.build_catalog(rows)
+                for property_id in changed:
+                    match_store.replace_matches(db, engine, available, property_id, self.threshold)
+            db.commit()
+            db.execute(delete(PropertyMatchStaging))
+            db.commit()
+        finally:
+            db.close()
+        # The staged pairs are gone, so there is nothing left to resume
+        os.remove(self.checkpoint_path)
+
+
+def precompute(
+    engine: ScoringEngine,
+    available: np.ndarray,
+    sink,
+    threshold: float,
+    block_size: int,
+    workers: int,
+) -> int:
+    """Score every block pair in a process pool, streaming results into `sink`. Returns pairs written."""
+    done = sink.completed()
+    tasks = [task for task in block_pairs(len(engine), block_size) if task[0] not in done]
+    total = len(done) + len(tasks)
+    finished = len(done)
+    written = 0
+    started = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine, available)) as pool:
+        pending = {}
+        queue = iter(tasks)
+
+        def submit_next() -> None:
+            task = next(queue, None)
+            if task is not None:
+                pair, source_block, target_block = task
+                pending[pool.submit(score_block_pair, source_block, target_block, threshold)] = pair
+
+        # Keep a bounded number of tasks in flight so results stream out steadily
+        for _ in range(2 * workers):
+            submit_next()
+        while pending:
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                pair = pending.pop(future)
+                result = future.result()
+                sink.write(pair, result)
+                written += len(result["score"])
+                finished += 1
+                submit_next()
+
+            elapsed = time.monotonic() - started
+            rate = (finished - len(done)) / elapsed if elapsed else 0.0
+            eta = (total - finished) / rate if rate else float("inf")
+            print(
+                f"\r[{finished}/{total}] block pairs, {written} matches, "
+                f"{rate:.1f} pairs/s, eta {eta:.0f}s",
+                end="", file=sys.stderr, flush=True,
+            )
+    print(file=sys.stderr)
+    sink.close()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute the sparse all-pairs match score matrix.")
+    parser.add_argument("--threshold", type=float, default=settings.MATCH_STORE_MIN_SCORE)
+    parser.add_argument("--block-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", help="Directory for compressed npz parts; omit to write property_matches")
+    parser.add_argument("--checkpoint", default=".precompute-checkpoint",
+                        help="Checkpoint file used when writing to the database")
+    parser.add_argument("--resume", action="store_true", help="Skip block pairs completed by a previous run")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    rows = PropertyMatcher.catalog_rows(db)
+    # Do not sit idle in the snapshot's transaction for the whole run
+    db.commit()
+    engine, available = PropertyMatcher.build_catalog(rows)
+    run_id = fingerprint(rows, args.threshold, args.block_size)
+    if args.output:
+        db.close()
+        sink = NpzSink(args.output, run_id, engine.ids, args.resume)
+    else:
+        sink = DatabaseSink(db, args.checkpoint, run_id, args.resume, rows, args.threshold, args.block_size)
+
+    written = precompute(engine, available, sink, args.threshold, args.block_size, args.workers)
+    print(f"Wrote {written} matches for {len(engine)} properties")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,68 @@
-from typing import List, Dict, Optional, Set, Tuple
+import math
+import threading
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.core.normalization import PROPERTY_TYPE_CODES, split_location
+from app.db.session import release_connection
 from app.models.property import Property
 from app.models.exchange import Exchange
+from app.matching import catalog_version, match_store
+from app.matching.candidate_index import BucketIndex
+from app.matching.chain_search import best_first_chains, depth_first_chains
+from app.matching.match_graph import MatchGraph
+from app.matching.pruning import score_bound_filter
+from app.matching.ring_search import find_all_rings, find_rings_through
+from app.matching.scoring_engine import ScoringEngine, build_type_matrix
 
 class PropertyMatcher:
     # Default value tolerance (15%)
     VALUE_TOLERANCE = 0.15
+
+    # Weighted average of component scores (adjust weights as needed)
+    SCORE_WEIGHTS = {
+        'value': 0.4,
+        'location': 0.3,
+        'type': 0.3
+    }
     
+    # Distance at which the distance-based location score has decayed most of the way to 0.2
+    DISTANCE_DECAY_MILES = 25.0
+
+    # Upper bound on cells in one batched score matrix (~64 MB of float64)
+    SCORE_MATRIX_CELLS = 8_000_000
+
+    # Coarse type groups used to bucket candidates for approximate matching
+    TYPE_COMPATIBILITY_CLASSES = {
+        "residential": 0,
+        "multi_family": 0,
+        "commercial": 1,
+        "retail": 1,
+        "industrial": 1,
+        "land": 2
+    }
+
+    # Cached (catalog version, engine) over the available catalog, shared by
+    # radius and approximate matching; the engine builds its KD-tree once
+    _catalog_engine: Optional[Tuple[int, ScoringEngine]] = None
+    _catalog_engine_lock = threading.Lock()
+
+    # Cached (engine, index) for approximate matching, over the cached engine
+    _candidate_index: Optional[Tuple[ScoringEngine, BucketIndex]] = None
+    _candidate_index_lock = threading.Lock()
+
+    # Match results as (property id, score) lists, keyed by request and catalog version
+    _match_cache = LRUCache("match", settings.MATCH_CACHE_SIZE, settings.MATCH_CACHE_TTL_SECONDS)
+
+    # Identical concurrent requests share one computation
+    _match_flights = SingleFlight("match")
+    _chain_flights = SingleFlight("chain_search")
+
     # Property type compatibility matrix
     # 1.0 = perfect match, 0.0 = incompatible
     PROPERTY_TYPE_COMPATIBILITY = {
@@ -78,18 +134,20 @@ class PropertyMatcher:
         # Simple location matching for now - can be enhanced with geocoding
         if source_location.lower() == target_location.lower():
             return 1.0
-        # Check if same city/region (assuming format "City, State")
-        source_city = source_location.split(',')[0].strip().lower()
-        target_city = target_location.split(',')[0].strip().lower()
+        # Compare city, then state (assuming format "City, State")
+        source_city, source_state = split_location(source_location)
+        target_city, target_state = split_location(target_location)
         if source_city == target_city:
             return 0.8
-        # Check if same state
-        source_state = source_location.split(',')[1].strip().lower() if len(source_location.split(',')) > 1 else ''
-        target_state = target_location.split(',')[1].strip().lower() if len(target_location.split(',')) > 1 else ''
         if source_state and target_state and source_state == target_state:
             return 0.5
         return 0.2
 
+    @classmethod
+    def calculate_distance_score(cls, miles: float) -> float:
+        """Location score from great-circle distance: 1.0 at the same point, decaying towards 0.2."""
+        return 0.2 + 0.8 * math.exp(-miles / cls.DISTANCE_DECAY_MILES)
+
     @classmethod
     def calculate_property_type_compatibility(cls, source_type: str, target_type: str) -> float:
         """Calculate compatibility score between property types."""
@@ -109,13 +167,8 @@ class PropertyMatcher:
         location_score = cls.calculate_location_score(source_property.location, target_property.location)
         type_score = cls.calculate_property_type_compatibility(source_property.property_type, target_property.property_type)
         
-        # Weighted average of scores (adjust weights as needed)
-        weights = {
-            'value': 0.4,
-            'location': 0.3,
-            'type': 0.3
-        }
-        
+        weights = cls.SCORE_WEIGHTS
+
         total_score = (
             value_score * weights['value'] +
             location_score * weights['location'] +
@@ -124,38 +177,430 @@ class PropertyMatcher:
         
         return total_score
 
+    @classmethod
+    def build_engine(cls, rows: List[Tuple]) -> ScoringEngine:
+        """Build a columnar scoring engine over rows of the candidate_columns shape."""
+        return ScoringEngine(
+            rows,
+            type_compatibility=cls.PROPERTY_TYPE_COMPATIBILITY,
+            tolerance=cls.VALUE_TOLERANCE,
+            weights=cls.SCORE_WEIGHTS,
+            distance_decay_miles=cls.DISTANCE_DECAY_MILES,
+        )
+
+    @staticmethod
+    def candidate_columns(db: Session):
+        """Query the scoring columns of every available property, without hydrating ORM objects."""
+        return (
+            db.query(
+                Property.id,
+                Property.owner_id,
+                Property.price,
+                Property.location,
+                Property.city,
+                Property.state,
+                Property.property_type_code,
+                Property.latitude,
+                Property.longitude,
+            )
+            .filter(Property.status == "available")
+        )
+
+    @staticmethod
+    def load_properties(db: Session, ids: List[int]) -> List[Property]:
+        """Load properties by id, preserving the order of `ids`."""
+        if not ids:
+            return []
+        by_id = {
+            prop.id: prop
+            for prop in db.query(Property).filter(Property.id.in_(ids)).all()
+        }
+        return [by_id[prop_id] for prop_id in ids if prop_id in by_id]
+
     @classmethod
     def find_matching_properties(
         cls,
         db: Session,
         source_property: Property,
         min_score: float = 0.6,
-        limit: int = 10
+        limit: int = 10,
+        radius_miles: Optional[float] = None,
+        probes: Optional[int] = None
     ) -> List[Tuple[Property, float]]:
-        """Find matching properties with their match scores."""
-        # Query available properties
-        available_properties = (
-            db.query(Property)
-            .filter(Property.status == "available")
+        """
+        Find matching properties with their match scores.
+
+        With `radius_miles`, only properties within that distance are
+        considered and location is scored by distance; a source that could
+        not be geocoded has no matches. See find_matching_properties_within_radius.
+
+        With `probes`, candidates come from the approximate bucket index,
+        even where the stored matches would answer exactly; see
+        find_matching_properties_approximate. It is ignored with `radius_miles`.
+        """
+        if radius_miles is not None:
+            return cls.find_matching_properties_within_radius(db, source_property, min_score, limit, radius_miles)
+        if probes is not None:
+            return cls.find_matching_properties_approximate(db, source_property, min_score, limit, probes)
+        if match_store.covers(db, min_score):
+            return match_store.find_matches(db, source_property.id, min_score, limit)
+
+        # Only read the buckets whose score upper bound can reach min_score
+        bound_filter = score_bound_filter(
+            source_property.price,
+            source_property.location,
+            source_property.property_type,
+            min_score,
+            type_matrix=build_type_matrix(cls.PROPERTY_TYPE_COMPATIBILITY),
+            tolerance=cls.VALUE_TOLERANCE,
+            weights=cls.SCORE_WEIGHTS,
+        )
+        if bound_filter is None:
+            return []
+        query = (
+            cls.candidate_columns(db)
             .filter(Property.id != source_property.id)
             .filter(Property.owner_id != source_property.owner_id)
-            .all()
+            .filter(bound_filter)
         )
-        
-        # Calculate scores for each property
-        scored_properties = [
-            (prop, cls.calculate_match_score(source_property, prop))
-            for prop in available_properties
+
+        # Load the surviving candidate columns and score them in one batched pass
+        engine = cls.build_engine(query.all())
+        scores = engine.score(
+            source_property.price,
+            source_property.location,
+            source_property.property_type,
+        )
+        top_rows, top_scores = engine.top_k(scores, min_score, limit)
+
+        # Only hydrate the properties that made the cut
+        ids = engine.ids[top_rows].tolist()
+        properties = {prop.id: prop for prop in cls.load_properties(db, ids)}
+        return [
+            (properties[prop_id], float(score))
+            for prop_id, score in zip(ids, top_scores)
+            if prop_id in properties
         ]
-        
-        # Filter by minimum score and sort by score descending
-        matched_properties = [
-            (prop, score) for prop, score in scored_properties
-            if score >= min_score
+
+    @staticmethod
+    def match_cache_key(
+        source_id: int,
+        min_score: float,
+        limit: int,
+        radius_miles: Optional[float],
+        probes: Optional[int],
+        version: int
+    ) -> Tuple:
+        return (source_id, min_score, limit, radius_miles, probes, version)
+
+    @classmethod
+    def find_matching_properties_cached(
+        cls,
+        db: Session,
+        source_property: Property,
+        min_score: float = 0.6,
+        limit: int = 10,
+        radius_miles: Optional[float] = None,
+        probes: Optional[int] = None,
+        version: Optional[int] = None
+    ) -> List[Tuple[Property, float]]:
+        """
+        find_matching_properties behind the match result cache.
+
+        Entries are keyed by the catalog version, which every property write
+        bumps, so a cached result is never older than the catalog. On a miss,
+        concurrent identical requests wait for a single computation, without
+        holding a database connection, for up to COALESCE_WAIT_SECONDS.
+        """
+        if version is None:
+            version = catalog_version.current(db)
+        key = cls.match_cache_key(source_property.id, min_score, limit, radius_miles, probes, version)
+
+        def compute() -> List[Tuple[int, float]]:
+            cached = cls._match_cache.get(key)
+            if cached is not None:
+                return cached
+            matches = cls.find_matching_properties(db, source_property, min_score, limit, radius_miles, probes)
+            scored_ids = [(prop.id, score) for prop, score in matches]
+            cls._match_cache.set(key, scored_ids)
+            return scored_ids
+
+        scored_ids = cls._match_flights.do(
+            key, compute, before_wait=lambda: release_connection(db), timeout=settings.COALESCE_WAIT_SECONDS
+        )
+        properties = {prop.id: prop for prop in cls.load_properties(db, [prop_id for prop_id, _ in scored_ids])}
+        return [(properties[prop_id], score) for prop_id, score in scored_ids if prop_id in properties]
+
+    @classmethod
+    def catalog_engine(cls, db: Session) -> ScoringEngine:
+        """The cached scoring engine over available properties, rebuilt once the catalog changes."""
+        version = catalog_version.current(db)
+        with cls._catalog_engine_lock:
+            cached = cls._catalog_engine
+            if cached is None or cached[0] != version:
+                cached = cls._catalog_engine = (version, cls.build_engine(cls.candidate_columns(db).all()))
+            return cached[1]
+
+    @classmethod
+    def candidate_index(cls, db: Session) -> Tuple[ScoringEngine, BucketIndex]:
+        """The cached bucket index over available properties, rebuilt once the catalog changes."""
+        engine = cls.catalog_engine(db)
+        with cls._candidate_index_lock:
+            cached = cls._candidate_index
+            if cached is None or cached[0] is not engine:
+                type_classes = {
+                    code: cls.TYPE_COMPATIBILITY_CLASSES[name]
+                    for name, code in PROPERTY_TYPE_CODES.items()
+                    if name in cls.TYPE_COMPATIBILITY_CLASSES
+                }
+                cached = cls._candidate_index = (engine, BucketIndex(engine, type_classes))
+            return cached
+
+    @classmethod
+    def find_matching_properties_within_radius(
+        cls,
+        db: Session,
+        source_property: Property,
+        min_score: float,
+        limit: int,
+        radius_miles: float
+    ) -> List[Tuple[Property, float]]:
+        """
+        Query the cached catalog's KD-tree for candidates within `radius_miles`
+        and score only those, loading no rows but the returned matches.
+        """
+        if source_property.latitude is None:
+            return []
+        engine = cls.catalog_engine(db)
+        rows, scores = engine.score_within_radius(
+            source_property.price,
+            source_property.location,
+            source_property.property_type,
+            source_property.latitude,
+            source_property.longitude,
+            radius_miles,
+        )
+        mask = engine.candidate_mask(source_property.id, source_property.owner_id)[rows]
+        top_rows, top_scores = engine.top_k(scores, min_score, limit, mask=mask)
+
+        ids = engine.ids[rows[top_rows]].tolist()
+        properties = {prop.id: prop for prop in cls.load_properties(db, ids)}
+        return [
+            (properties[prop_id], float(score))
+            for prop_id, score in zip(ids, top_scores)
+            if prop_id in properties
         ]
-        matched_properties.sort(key=lambda x: x[1], reverse=True)
-        
-        return matched_properties[:limit]
+
+    @classmethod
+    def find_matching_properties_approximate(
+        cls,
+        db: Session,
+        source_property: Property,
+        min_score: float = 0.6,
+        limit: int = 10,
+        probes: int = 4
+    ) -> List[Tuple[Property, float]]:
+        """
+        Score only the candidates from the source's bucket and its `probes`
+        best neighbouring buckets. Returned scores are exact, but matches
+        outside the probed buckets are missed.
+        """
+        engine, index = cls.candidate_index(db)
+        _, city_code, state_code, type_code = engine.encode_source(
+            source_property.location, source_property.property_type
+        )
+        rows = index.candidates(source_property.price, city_code, state_code, type_code, min_score, probes)
+        scores = engine.score_rows(
+            source_property.price, source_property.location, source_property.property_type, rows
+        )
+        mask = engine.candidate_mask(source_property.id, source_property.owner_id)[rows]
+        top_rows, top_scores = engine.top_k(scores, min_score, limit, mask=mask)
+
+        ids = engine.ids[rows[top_rows]].tolist()
+        properties = {prop.id: prop for prop in cls.load_properties(db, ids)}
+        return [
+            (properties[prop_id], float(score))
+            for prop_id, score in zip(ids, top_scores)
+            if prop_id in properties
+        ]
+
+    @classmethod
+    def find_matching_properties_batch(
+        cls,
+        db: Session,
+        source_properties: List[Property],
+        min_score: float = 0.6,
+        limit: int = 10
+    ) -> Dict[int, List[Tuple[Property, float]]]:
+        """
+        Find matches for many source properties against a single catalog load.
+
+        Same semantics as find_matching_properties for each source.
+        """
+        if match_store.covers(db, min_score):
+            adjacency = match_store.graph_loader(db, min_score, limit)(
+                [source.id for source in source_properties]
+            )
+        else:
+            engine = cls.build_engine(cls.candidate_columns(db).all())
+            adjacency = {}
+            # Score sources in blocks to bound the size of the score matrix
+            block_size = max(1, cls.SCORE_MATRIX_CELLS // max(len(engine), 1))
+            for start in range(0, len(source_properties), block_size):
+                block = source_properties[start:start + block_size]
+                scores = engine.score_many(
+                    [(source.price, source.location, source.property_type) for source in block]
+                )
+                for source, source_scores in zip(block, scores):
+                    rows, top_scores = engine.top_k(
+                        source_scores,
+                        min_score,
+                        limit,
+                        mask=engine.candidate_mask(source.id, source.owner_id),
+                    )
+                    adjacency[source.id] = list(zip(engine.ids[rows].tolist(), top_scores.tolist()))
+
+        target_ids = list(dict.fromkeys(prop_id for neighbours in adjacency.values() for prop_id, _ in neighbours))
+        properties = {prop.id: prop for prop in cls.load_properties(db, target_ids)}
+        return {
+            source_id: [(properties[prop_id], score) for prop_id, score in neighbours if prop_id in properties]
+            for source_id, neighbours in adjacency.items()
+        }
+
+    @staticmethod
+    def catalog_rows(db: Session, criterion=None) -> List[Tuple]:
+        """
+        Scoring columns plus status of every property, whatever its status,
+        in id order. `criterion` restricts them to matching rows.
+        """
+        query = db.query(
+            Property.id,
+            Property.owner_id,
+            Property.price,
+            Property.location,
+            Property.city,
+            Property.state,
+            Property.property_type_code,
+            Property.latitude,
+            Property.longitude,
+            Property.status,
+        )
+        if criterion is not None:
+            query = query.filter(criterion)
+        return query.order_by(Property.id).all()
+
+    @classmethod
+    def build_catalog(cls, rows: List[Tuple]) -> Tuple[ScoringEngine, np.ndarray]:
+        """Scoring engine over catalog_rows, with a mask of the available rows."""
+        engine = cls.build_engine([row[:9] for row in rows])
+        available = np.array([row[9] == "available" for row in rows], dtype=bool)
+        return engine, available
+
+    @classmethod
+    def load_catalog(cls, db: Session, criterion=None) -> Tuple[ScoringEngine, np.ndarray]:
+        """Snapshot every property, or those matching `criterion`, with a mask of the available rows."""
+        return cls.build_catalog(cls.catalog_rows(db, criterion))
+
+    @classmethod
+    def match_neighbourhood(cls, property: Property, min_score: float):
+        """
+        SQL predicate selecting the property plus every property that could
+        score at least `min_score` with it, as source or as target.
+        """
+        options = dict(
+            type_matrix=build_type_matrix(cls.PROPERTY_TYPE_COMPATIBILITY),
+            tolerance=cls.VALUE_TOLERANCE,
+            weights=cls.SCORE_WEIGHTS,
+        )
+        predicates = [Property.id == property.id]
+        for reverse in (False, True):
+            bound_filter = score_bound_filter(
+                property.price, property.location, property.property_type, min_score, reverse=reverse, **options
+            )
+            if bound_filter is not None:
+                predicates.append(bound_filter)
+        return or_(*predicates)
+
+    # Store upkeep on writes. Callers flush the property, bump the catalog
+    # version, run upkeep, then commit. There is no separate write lock: the
+    # version row locked by bump is held until commit, so property writes
+    # serialize only over upkeep and commit. That is what lets a write score
+    # against every property committed before it, so concurrent creates
+    # cannot miss each other's pairs. Nothing is kept up until the first
+    # build, which reads the whole catalog anyway; until then upkeep returns
+    # at once and the row lock spans little more than the commit.
+
+    @classmethod
+    def refresh_stored_matches(cls, db: Session, property: Property) -> None:
+        """Rescore a created or updated property in property_matches, reading only its possible matches."""
+        if not settings.MATCH_STORE_ENABLED or match_store.built_min_score(db) is None:
+            return
+        min_score = settings.MATCH_STORE_MIN_SCORE
+        engine, available = cls.load_catalog(db, cls.match_neighbourhood(property, min_score))
+        match_store.replace_matches(db, engine, available, property.id, min_score)
+
+    @classmethod
+    def add_stored_matches(cls, db: Session, property_ids: List[int]) -> None:
+        """
+        Score a batch of newly inserted properties in property_matches. The
+        whole catalog is read once per batch, which is cheaper than one
+        neighbourhood query per property at import batch sizes.
+        """
+        if not settings.MATCH_STORE_ENABLED or not property_ids or match_store.built_min_score(db) is None:
+            return
+        engine, available = cls.load_catalog(db)
+        match_store.add_matches(db, engine, available, property_ids, settings.MATCH_STORE_MIN_SCORE)
+
+    @classmethod
+    def remove_stored_matches(cls, db: Session, property_id: int) -> None:
+        """Drop a property's pairs from property_matches."""
+        if settings.MATCH_STORE_ENABLED:
+            match_store.delete_matches(db, property_id)
+
+    @classmethod
+    def rebuild_stored_matches(cls, db: Session) -> int:
+        """
+        Recompute property_matches for the whole catalog. Returns the number
+        of pairs stored. Property writes wait on the catalog version lock
+        until the caller commits.
+        """
+        catalog_version.bump(db)
+        engine, available = cls.load_catalog(db)
+        return match_store.rebuild(db, engine, available, settings.MATCH_STORE_MIN_SCORE)
+
+    @classmethod
+    def build_match_graph(
+        cls,
+        db: Session,
+        source_property: Property,
+        min_score: float = 0.6,
+        limit: int = 10
+    ) -> MatchGraph:
+        """
+        Load the available catalog once and return a memoized match graph
+        seeded with the source property's neighbours.
+
+        When the stored matches cover `min_score`, neighbours are read from
+        property_matches instead.
+        """
+        if match_store.covers(db, min_score):
+            return MatchGraph(match_store.graph_loader(db, min_score, limit))
+
+        engine = cls.build_engine(cls.candidate_columns(db).all())
+        graph = MatchGraph.from_engine(engine, min_score, limit)
+
+        rows, scores = engine.top_k(
+            engine.score(
+                source_property.price,
+                source_property.location,
+                source_property.property_type,
+            ),
+            min_score,
+            limit,
+            mask=engine.candidate_mask(source_property.id, source_property.owner_id),
+        )
+        graph.add_node(source_property.id, list(zip(engine.ids[rows].tolist(), scores.tolist())))
+        return graph
 
     @classmethod
     def identify_exchange_chains(
@@ -163,44 +608,235 @@ class PropertyMatcher:
         db: Session,
         source_property: Property,
         max_chain_length: int = 3,
-        min_score: float = 0.6
+        min_score: float = 0.6,
+        progress: Optional[Callable[[float], None]] = None
     ) -> List[List[Tuple[Property, float]]]:
-        """Identify potential exchange chains starting from the source property."""
-        def build_chains(
-            current_property: Property,
-            current_chain: List[Tuple[Property, float]],
-            visited: Set[int]
-        ) -> List[List[Tuple[Property, float]]]:
-            if len(current_chain) >= max_chain_length:
-                return [current_chain]
-            
-            # Find matches for the current property
-            matches = cls.find_matching_properties(db, current_property, min_score)
-            
-            chains = []
-            for match_prop, match_score in matches:
-                if match_prop.id not in visited:
-                    new_visited = visited | {match_prop.id}
-                    new_chain = current_chain + [(match_prop, match_score)]
-                    
-                    # Add the current chain
-                    if len(new_chain) > 1:  # Only add chains with at least 2 properties
-                        chains.append(new_chain)
-                    
-                    # Continue building the chain
-                    extended_chains = build_chains(match_prop, new_chain, new_visited)
-                    chains.extend(extended_chains)
-            
-            return chains
-        
-        # Start building chains from the source property
-        initial_visited = {source_property.id}
-        chains = build_chains(source_property, [], initial_visited)
-        
+        """
+        Identify potential exchange chains starting from the source property.
+
+        `progress`, if given, is called with the completed fraction of the work.
+        """
+        report = progress or (lambda fraction: None)
+        graph = cls.build_match_graph(db, source_property, min_score)
+        report(0.1)
+        # Every node within reach is expanded, so load them level by level
+        graph.prefetch(
+            source_property.id,
+            max_chain_length - 1,
+            on_level=lambda level: report(0.1 + 0.7 * (level + 1) / max_chain_length),
+        )
+
+        # Search the in-memory graph starting from the source property
+        chains = list(depth_first_chains(graph, source_property.id, max_chain_length))
+
         # Sort chains by average score
         def chain_average_score(chain):
             return sum(score for _, score in chain) / len(chain)
-        
+
         chains.sort(key=chain_average_score, reverse=True)
-        
-        return chains 
\ No newline at end of file
+        report(0.9)
+
+        return cls.hydrate_chains(db, chains)
+
+    @classmethod
+    def iter_exchange_chains(
+        cls,
+        db: Session,
+        source_property: Property,
+        max_chain_length: int = 3,
+        min_score: float = 0.6,
+        batch_size: int = 500
+    ) -> Iterator[List[Tuple[Property, float]]]:
+        """
+        Yield the chains identify_exchange_chains would return, in discovery
+        order rather than by score.
+
+        Neighbours are loaded as the walk reaches them and chains are hydrated
+        `batch_size` at a time, so the first chains are available long before
+        the search finishes.
+        """
+        graph = cls.build_match_graph(db, source_property, min_score)
+        batch = []
+        for chain in depth_first_chains(graph, source_property.id, max_chain_length):
+            batch.append(chain)
+            if len(batch) == batch_size:
+                yield from cls.hydrate_chains(db, batch)
+                batch = []
+        if batch:
+            yield from cls.hydrate_chains(db, batch)
+
+    @classmethod
+    def search_exchange_chains(
+        cls,
+        db: Session,
+        source_property: Property,
+        max_chain_length: int = 3,
+        min_score: float = 0.6,
+        top_k: int = 20,
+        beam_width: Optional[int] = None,
+        time_budget_ms: Optional[int] = None,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> Tuple[List[List[Tuple[Property, float]]], bool]:
+        """
+        Best-first search for the `top_k` chains with the highest average score.
+
+        Returns the chains and whether the search was exhaustive.
+        """
+        report = progress or (lambda fraction: None)
+        graph = cls.build_match_graph(db, source_property, min_score)
+        report(0.1)
+        result = best_first_chains(
+            graph,
+            source_property.id,
+            max_chain_length,
+            top_k,
+            beam_width=beam_width,
+            time_budget_ms=time_budget_ms,
+            max_edge_score=sum(cls.SCORE_WEIGHTS.values()),
+        )
+        report(0.9)
+        return cls.hydrate_chains(db, result.chains), result.exhaustive
+
+    @classmethod
+    def find_exchange_chains(
+        cls,
+        db: Session,
+        source_property: Property,
+        max_chain_length: int = 3,
+        min_score: float = 0.6,
+        mode: str = "exhaustive",
+        top_k: int = 20,
+        beam_width: Optional[int] = None,
+        time_budget_ms: Optional[int] = None,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> Tuple[List[List[Tuple[Property, float]]], bool]:
+        """
+        Run identify_exchange_chains, or search_exchange_chains for
+        `mode="best_first"`. Returns the chains and whether the search was exhaustive.
+        """
+        if mode == "best_first":
+            return cls.search_exchange_chains(
+                db, source_property, max_chain_length, min_score, top_k, beam_width, time_budget_ms, progress
+            )
+        return cls.identify_exchange_chains(db, source_property, max_chain_length, min_score, progress), True
+
+    @classmethod
+    def find_exchange_chains_coalesced(
+        cls,
+        db: Session,
+        source_property: Property,
+        max_chain_length: int = 3,
+        min_score: float = 0.6,
+        mode: str = "exhaustive",
+        top_k: int = 20,
+        beam_width: Optional[int] = None,
+        time_budget_ms: Optional[int] = None
+    ) -> Tuple[List[List[Tuple[Property, float]]], bool]:
+        """find_exchange_chains where identical concurrent searches share one computation."""
+        key = (
+            source_property.id, max_chain_length, min_score, mode,
+            (top_k, beam_width, time_budget_ms) if mode == "best_first" else None,
+            catalog_version.current(db),
+        )
+
+        def compute() -> Tuple[List[List[Tuple[int, float]]], bool]:
+            chains, exhaustive = cls.find_exchange_chains(
+                db, source_property, max_chain_length, min_score, mode, top_k, beam_width, time_budget_ms
+            )
+            return [[(prop.id, score) for prop, score in chain] for chain in chains], exhaustive
+
+        chains, exhaustive = cls._chain_flights.do(
+            key, compute, before_wait=lambda: release_connection(db), timeout=settings.COALESCE_WAIT_SECONDS
+        )
+        return cls.hydrate_chains(db, chains), exhaustive
+
+    @classmethod
+    def hydrate_chains(
+        cls,
+        db: Session,
+        chains: List[List[Tuple[int, float]]]
+    ) -> List[List[Tuple[Property, float]]]:
+        """
+        Replace property ids in chains with properties loaded in a single query.
+
+        Chains through a property that no longer exists are dropped.
+        """
+        chain_ids = list(dict.fromkeys(prop_id for chain in chains for prop_id, _ in chain))
+        properties = {prop.id: prop for prop in cls.load_properties(db, chain_ids)}
+        return [
+            [(properties[prop_id], score) for prop_id, score in chain]
+            for chain in chains
+            if all(prop_id in properties for prop_id, _ in chain)
+        ]
+
+    @staticmethod
+    def load_owners(db: Session, ids: List[int]) -> Dict[int, Optional[int]]:
+        """Map property ids to their owner ids."""
+        owners = {}
+        for start in range(0, len(ids), match_store.BATCH_SIZE):
+            owners.update(
+                db.query(Property.id, Property.owner_id)
+                .filter(Property.id.in_(ids[start:start + match_store.BATCH_SIZE]))
+                .all()
+            )
+        return owners
+
+    @classmethod
+    def build_catalog_graph(
+        cls,
+        db: Session,
+        min_score: float = 0.6,
+        limit: int = 10
+    ) -> Tuple[MatchGraph, Dict[int, Optional[int]]]:
+        """Load the match graph of the whole available catalog, plus each node's owner."""
+        if match_store.covers(db, min_score):
+            owners = dict(
+                db.query(Property.id, Property.owner_id)
+                .filter(Property.status == "available")
+                .all()
+            )
+            graph = MatchGraph(match_store.graph_loader(db, min_score, limit))
+        else:
+            engine = cls.build_engine(cls.candidate_columns(db).all())
+            owners = {
+                prop_id: (owner_id if owner_id >= 0 else None)
+                for prop_id, owner_id in zip(engine.ids.tolist(), engine.owner_ids.tolist())
+            }
+            graph = MatchGraph.from_engine(engine, min_score, limit)
+        graph.load(list(owners))
+        return graph, owners
+
+    @classmethod
+    def find_exchange_rings(
+        cls,
+        db: Session,
+        source_property: Property,
+        max_ring_length: int = 3,
+        min_score: float = 0.6,
+        limit: int = 20
+    ) -> List[List[Tuple[Property, float]]]:
+        """
+        Find closed swap rings through the source property: each owner receives
+        the next property in the ring, and the last owner receives the source.
+        """
+        graph = cls.build_match_graph(db, source_property, min_score)
+        # Any ring through the source only uses nodes within this many hops
+        graph.prefetch(source_property.id, max_ring_length - 1)
+        owners = cls.load_owners(db, list(graph.adjacency))
+        owners[source_property.id] = source_property.owner_id
+
+        rings = find_rings_through(source_property.id, graph.adjacency, owners, max_ring_length)
+        return cls.hydrate_chains(db, rings[:limit])
+
+    @classmethod
+    def find_all_exchange_rings(
+        cls,
+        db: Session,
+        max_ring_length: int = 3,
+        min_score: float = 0.6,
+        limit: int = 100
+    ) -> List[List[Tuple[Property, float]]]:
+        """Find every swap ring in the available catalog from a single graph build."""
+        graph, owners = cls.build_catalog_graph(db, min_score)
+        rings = find_all_rings(graph.adjacency, owners, max_ring_length)
+        return cls.hydrate_chains(db, rings[:limit])
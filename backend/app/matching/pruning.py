@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, or_, true
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.normalization import property_type_code, split_location
+from app.models.property import Property
+
+# Slack so float rounding in the exact scorer never loses a borderline pair
+EPSILON = 1e-9
+
+
+def score_bound_filter(
+    price: Optional[float],
+    location: Optional[str],
+    property_type: Optional[str],
+    min_score: float,
+    *,
+    type_matrix: np.ndarray,
+    tolerance: float,
+    weights: Dict[str, float],
+    reverse: bool = False,
+) -> Optional[ColumnElement]:
+    """
+    SQL predicate selecting every candidate that could score at least
+    `min_score` against the source, or None when no candidate can.
+
+    With `reverse`, the given attributes are the target instead, and the
+    predicate selects every source that could score at least `min_score`
+    against it.
+
+    Candidates are grouped into buckets by location class (same city, same
+    state, elsewhere) and property type. Each bucket's best location and
+    type scores are known without reading a row, which leaves the value
+    score each bucket still needs; that becomes a price band, or drops the
+    bucket when even a perfect price match falls short. The predicate is a
+    superset of the qualifying rows, so survivors must still be scored.
+    """
+    city, state = split_location(location)
+    code = property_type_code(property_type)
+    type_scores = type_matrix[:, code] if reverse else type_matrix[code]
+    # Best location score per class; an exact location match implies the same city
+    location_classes = [(1.0, Property.city == city)]
+    if state:
+        location_classes.append((0.5, Property.state == state))
+    location_classes.append((0.2, None))
+
+    has_price = price is not None and price > 0
+    buckets: List[ColumnElement] = []
+    for location_bound, location_predicate in location_classes:
+        codes_by_band: Dict[Optional[tuple], List[int]] = {}
+        for code, type_score in enumerate(type_scores.tolist()):
+            needed = min_score - location_bound * weights['location'] - type_score * weights['type'] - EPSILON
+            if needed <= 0:
+                band = None
+            elif not has_price or needed > weights['value']:
+                continue
+            else:
+                # value = 1 - |source - target| / (source * tolerance) must reach needed / weight
+                ratio = tolerance * (1 - needed / weights['value'])
+                if reverse:
+                    band = (price / (1 + ratio) * (1 - EPSILON), price / (1 - ratio) * (1 + EPSILON))
+                else:
+                    spread = price * ratio * (1 + EPSILON)
+                    band = (price - spread, price + spread)
+            codes_by_band.setdefault(band, []).append(code)
+
+        for band, codes in codes_by_band.items():
+            predicates = []
+            if location_predicate is not None:
+                predicates.append(location_predicate)
+            if len(codes) < len(type_scores):
+                predicates.append(Property.property_type_code.in_(codes))
+            if band is not None:
+                predicates.append(Property.price.between(*band))
+            if not predicates:
+                return true()
+            buckets.append(and_(*predicates))
+
+    return or_(*buckets) if buckets else None
@@ -0,0 +1,115 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.matching.match_graph import Neighbours
+
+# Edges in ring order; the last edge closes back on the first property's owner
+Ring = List[Tuple[int, float]]
+
+
+def _reverse(adjacency: Dict[int, Neighbours]) -> Dict[int, List[int]]:
+    reverse: Dict[int, List[int]] = {}
+    for node_id, neighbours in adjacency.items():
+        for neighbour_id, _ in neighbours:
+            reverse.setdefault(neighbour_id, []).append(node_id)
+    return reverse
+
+
+def _rings_through(
+    start_id: int,
+    adjacency: Dict[int, Neighbours],
+    reverse: Dict[int, List[int]],
+    owners: Dict[int, Optional[int]],
+    max_length: int,
+    allowed: Callable[[int], bool],
+) -> List[Ring]:
+    """
+    Enumerate simple cycles through `start_id` of at most `max_length`
+    properties, with every owner appearing once.
+
+    Hop distances back to the start, computed over reverse edges, act as
+    barriers: a node is only entered if the cycle can still close in time.
+    """
+    distance = {start_id: 0}
+    frontier = [start_id]
+    for hops in range(1, max_length):
+        next_frontier = []
+        for node_id in frontier:
+            for predecessor_id in reverse.get(node_id, ()):
+                if predecessor_id not in distance and allowed(predecessor_id):
+                    distance[predecessor_id] = hops
+                    next_frontier.append(predecessor_id)
+        frontier = next_frontier
+
+    rings: List[Ring] = []
+    path: List[Tuple[int, float]] = []
+    on_path = {start_id}
+    owners_on_path = {owners.get(start_id)}
+
+    def extend(node_id: int) -> None:
+        for neighbour_id, score in adjacency.get(node_id, ()):
+            if neighbour_id == start_id:
+                if path:
+                    rings.append(path + [(start_id, score)])
+                continue
+            hops_back = distance.get(neighbour_id)
+            if (
+                hops_back is None
+                or neighbour_id in on_path
+                or owners.get(neighbour_id) in owners_on_path
+                or len(path) + 1 + hops_back > max_length
+            ):
+                continue
+            path.append((neighbour_id, score))
+            on_path.add(neighbour_id)
+            owners_on_path.add(owners.get(neighbour_id))
+            extend(neighbour_id)
+            owners_on_path.discard(owners.get(neighbour_id))
+            on_path.discard(neighbour_id)
+            path.pop()
+
+    extend(start_id)
+    return rings
+
+
+def ring_average_score(ring: Ring) -> float:
+    return sum(score for _, score in ring) / len(ring)
+
+
+def find_rings_through(
+    start_id: int,
+    adjacency: Dict[int, Neighbours],
+    owners: Dict[int, Optional[int]],
+    max_length: int,
+) -> List[Ring]:
+    """Every ring through one property, best average score first."""
+    rings = _rings_through(
+        start_id, adjacency, _reverse(adjacency), owners, max_length, lambda node_id: True
+    )
+    rings.sort(key=ring_average_score, reverse=True)
+    return rings
+
+
+def find_all_rings(
+    adjacency: Dict[int, Neighbours],
+    owners: Dict[int, Optional[int]],
+    max_length: int,
+    start_ids: Optional[Iterable[int]] = None,
+) -> List[Ring]:
+    """
+    Every ring in the graph, each reported once, best average score first.
+
+    This is the length-bounded form of Johnson's algorithm: cycles are
+    rooted at their smallest property id, so the search from each root only
+    visits larger ids, and hop-distance barriers replace blocked sets.
+    """
+    reverse = _reverse(adjacency)
+    rings: List[Ring] = []
+    for start_id in sorted(adjacency if start_ids is None else start_ids):
+        rings.extend(
+            _rings_through(
+                start_id, adjacency, reverse, owners, max_length,
+                lambda node_id, start_id=start_id: node_id > start_id,
+            )
+        )
+    rings.sort(key=ring_average_score, reverse=True)
+    return rings
@@ -0,0 +1,319 @@
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.normalization import (
+    PROPERTY_TYPE_CODES,
+    UNKNOWN_PROPERTY_TYPE,
+    property_type_code,
+    split_location,
+)
+from app.matching.spatial_index import SpatialIndex
+
+# Sentinel codes: empty state never matches, unseen strings never match
+EMPTY_CODE = -1
+UNKNOWN_CODE = -2
+
+
+def build_type_matrix(type_compatibility: Dict[str, Dict[str, float]]) -> np.ndarray:
+    """Compatibility scores indexed by stored property_type_code; the unknown code stays incompatible."""
+    size = max(PROPERTY_TYPE_CODES.values()) + 1
+    type_matrix = np.zeros((size, size))
+    for source_type, targets in type_compatibility.items():
+        for target_type, score in targets.items():
+            if source_type in PROPERTY_TYPE_CODES and target_type in PROPERTY_TYPE_CODES:
+                type_matrix[PROPERTY_TYPE_CODES[source_type], PROPERTY_TYPE_CODES[target_type]] = score
+    return type_matrix
+
+
+class ScoringEngine:
+    """
+    Columnar snapshot of a candidate catalog used to score one source
+    property against every candidate in a single NumPy pass.
+
+    Scores are bit-for-bit identical to PropertyMatcher.calculate_match_score.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Sequence],
+        *,
+        type_compatibility: Dict[str, Dict[str, float]],
+        tolerance: float,
+        weights: Dict[str, float],
+        distance_decay_miles: float = 25.0,
+    ):
+        """
+        Build the snapshot from `(id, owner_id, price, location, city, state,
+        property_type_code, latitude, longitude)` rows, i.e. the normalized
+        columns of properties.
+        """
+        self.tolerance = tolerance
+        self.weights = weights
+        self.distance_decay_miles = distance_decay_miles
+
+        self.type_matrix = build_type_matrix(type_compatibility)
+
+        self.location_vocab: Dict[str, int] = {}
+        self.city_vocab: Dict[str, int] = {}
+        self.state_vocab: Dict[str, int] = {}
+
+        ids: List[int] = []
+        owner_ids: List[int] = []
+        prices: List[float] = []
+        location_codes: List[int] = []
+        city_codes: List[int] = []
+        state_codes: List[int] = []
+        type_codes: List[int] = []
+        latitudes: List[float] = []
+        longitudes: List[float] = []
+        for prop_id, owner_id, price, location, city, state, type_code, latitude, longitude in rows:
+            if city is None:
+                # Rows written before normalization was backfilled
+                city, state = split_location(location)
+            ids.append(prop_id)
+            owner_ids.append(-1 if owner_id is None else owner_id)
+            prices.append(np.nan if price is None else price)
+            location_codes.append(self._intern(self.location_vocab, (location or '').lower()))
+            city_codes.append(self._intern(self.city_vocab, city))
+            state_codes.append(self._intern(self.state_vocab, state) if state else EMPTY_CODE)
+            type_codes.append(UNKNOWN_PROPERTY_TYPE if type_code is None else type_code)
+            latitudes.append(np.nan if latitude is None else latitude)
+            longitudes.append(np.nan if longitude is None else longitude)
+
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.owner_ids = np.asarray(owner_ids, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.location_codes = np.asarray(location_codes, dtype=np.int32)
+        self.city_codes = np.asarray(city_codes, dtype=np.int32)
+        self.state_codes = np.asarray(state_codes, dtype=np.int32)
+        self.type_codes = np.asarray(type_codes, dtype=np.int16)
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.row_by_id = {prop_id: row for row, prop_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @cached_property
+    def spatial_index(self) -> SpatialIndex:
+        """KD-tree over the geocoded rows, built on first radius query."""
+        return SpatialIndex(self.latitudes, self.longitudes)
+
+    @staticmethod
+    def _intern(vocab: Dict[str, int], value: str) -> int:
+        code = vocab.get(value)
+        if code is None:
+            code = vocab[value] = len(vocab)
+        return code
+
+    def encode_source(
+        self, location: Optional[str], property_type: Optional[str]
+    ) -> Tuple[int, int, int, int]:
+        """Encode a source's location and type against this catalog's vocabularies."""
+        city, state = split_location(location)
+        return (
+            self.location_vocab.get((location or '').lower(), UNKNOWN_CODE),
+            self.city_vocab.get(city, UNKNOWN_CODE),
+            self.state_vocab.get(state, UNKNOWN_CODE) if state else EMPTY_CODE,
+            property_type_code(property_type),
+        )
+
+    def value_scores(self, source_price: float) -> np.ndarray:
+        """Vectorized PropertyMatcher.calculate_value_match against every candidate."""
+        min_acceptable = source_price * (1 - self.tolerance)
+        max_acceptable = source_price * (1 + self.tolerance)
+        in_range = (self.prices >= min_acceptable) & (self.prices <= max_acceptable)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_diff_ratio = np.abs(source_price - self.prices) / source_price
+            return np.where(in_range, 1.0 - (price_diff_ratio / self.tolerance), 0.0)
+
+    def location_scores(self, location_code: int, city_code: int, state_code: int) -> np.ndarray:
+        """Vectorized PropertyMatcher.calculate_location_score against every candidate."""
+        scores = np.full(len(self), 0.2)
+        if state_code >= 0:
+            scores[self.state_codes == state_code] = 0.5
+        scores[self.city_codes == city_code] = 0.8
+        scores[self.location_codes == location_code] = 1.0
+        return scores
+
+    def distance_scores(self, miles: np.ndarray) -> np.ndarray:
+        """Vectorized PropertyMatcher.calculate_distance_score."""
+        return 0.2 + 0.8 * np.exp(-miles / self.distance_decay_miles)
+
+    def type_scores(self, type_code: int) -> np.ndarray:
+        """Vectorized PropertyMatcher.calculate_property_type_compatibility."""
+        return self.type_matrix[type_code, self.type_codes]
+
+    def combine(self, value: np.ndarray, location: np.ndarray, type_: np.ndarray) -> np.ndarray:
+        """Weighted sum of component scores, in the same order as the scalar scorer."""
+        return (
+            value * self.weights['value'] +
+            location * self.weights['location'] +
+            type_ * self.weights['type']
+        )
+
+    def row_components(self, row: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Component scores of a catalog row, as source, against every candidate."""
+        return (
+            self.value_scores(self.prices[row]),
+            self.location_scores(self.location_codes[row], self.city_codes[row], self.state_codes[row]),
+            self.type_scores(self.type_codes[row]),
+        )
+
+    def reverse_row_components(self, row: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Component scores of every candidate, as source, against a catalog row as target."""
+        target_price = self.prices[row]
+        min_acceptable = self.prices * (1 - self.tolerance)
+        max_acceptable = self.prices * (1 + self.tolerance)
+        in_range = (target_price >= min_acceptable) & (target_price <= max_acceptable)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_diff_ratio = np.abs(self.prices - target_price) / self.prices
+            value = np.where(in_range, 1.0 - (price_diff_ratio / self.tolerance), 0.0)
+        # Location scoring is symmetric
+        location = self.location_scores(self.location_codes[row], self.city_codes[row], self.state_codes[row])
+        return value, location, self.type_matrix[self.type_codes, self.type_codes[row]]
+
+    def score_row(self, row: int) -> np.ndarray:
+        """Score a catalog row against every candidate, reusing its pre-encoded columns."""
+        return self.combine(*self.row_components(row))
+
+    def candidate_mask(self, source_id: int, source_owner_id: Optional[int]) -> np.ndarray:
+        """Exclude the source itself and every property of the source's owner."""
+        if source_owner_id is None:
+            # Mirrors SQL `owner_id != NULL`, which matches nothing
+            return np.zeros(len(self), dtype=bool)
+        return (self.ids != source_id) & (self.owner_ids != source_owner_id) & (self.owner_ids >= 0)
+
+    def score(
+        self, price: float, location: Optional[str], property_type: Optional[str]
+    ) -> np.ndarray:
+        """Score a source property's attributes against every candidate."""
+        location_code, city_code, state_code, type_code = self.encode_source(location, property_type)
+        return self.combine(
+            self.value_scores(price),
+            self.location_scores(location_code, city_code, state_code),
+            self.type_scores(type_code),
+        )
+
+    def score_rows(
+        self,
+        price: float,
+        location: Optional[str],
+        property_type: Optional[str],
+        rows: np.ndarray,
+    ) -> np.ndarray:
+        """Score a source's attributes against a subset of catalog rows."""
+        value, location_, type_ = self.components_many(
+            *self.encode_sources([(price, location, property_type)]), targets=rows
+        )
+        return self.combine(value[0], location_[0], type_[0])
+
+    def score_within_radius(
+        self,
+        price: float,
+        location: Optional[str],
+        property_type: Optional[str],
+        latitude: float,
+        longitude: float,
+        radius_miles: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score only the candidates within `radius_miles` of a point, with the
+        location component taken from distance instead of the location string.
+
+        Returns the candidate rows, in catalog order, and their scores.
+        """
+        rows, miles = self.spatial_index.query_radius(latitude, longitude, radius_miles)
+        value, _, type_ = self.components_many(*self.encode_sources([(price, location, property_type)]), targets=rows)
+        return rows, self.combine(value[0], self.distance_scores(miles), type_[0])
+
+    def encode_sources(
+        self, sources: Sequence[Tuple[float, Optional[str], Optional[str]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode `(price, location, property_type)` sources as a price vector and a code matrix."""
+        prices = np.array(
+            [np.nan if price is None else price for price, _, _ in sources], dtype=np.float64
+        )
+        codes = np.array(
+            [self.encode_source(location, property_type) for _, location, property_type in sources],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        return prices, codes
+
+    def row_sources(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Catalog rows as sources, in the format returned by encode_sources."""
+        codes = np.stack(
+            [self.location_codes[rows], self.city_codes[rows], self.state_codes[rows], self.type_codes[rows]],
+            axis=1,
+        ).astype(np.int64)
+        return self.prices[rows], codes
+
+    def components_many(
+        self,
+        source_prices: np.ndarray,
+        source_codes: np.ndarray,
+        targets=slice(None),
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Component score matrices of encoded sources against the `targets` rows,
+        given as a slice or an array of row indices.
+
+        Each has shape (len(sources), len(targets)).
+        """
+        prices = self.prices[targets]
+        source_prices = source_prices[:, None]
+        location_codes, city_codes, state_codes, type_codes = (source_codes[:, i, None] for i in range(4))
+
+        min_acceptable = source_prices * (1 - self.tolerance)
+        max_acceptable = source_prices * (1 + self.tolerance)
+        in_range = (prices >= min_acceptable) & (prices <= max_acceptable)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_diff_ratio = np.abs(source_prices - prices) / source_prices
+            value = np.where(in_range, 1.0 - (price_diff_ratio / self.tolerance), 0.0)
+
+        location = np.where(
+            self.location_codes[targets] == location_codes, 1.0,
+            np.where(
+                self.city_codes[targets] == city_codes, 0.8,
+                np.where((self.state_codes[targets] == state_codes) & (state_codes >= 0), 0.5, 0.2),
+            ),
+        )
+        return value, location, self.type_matrix[type_codes, self.type_codes[targets]]
+
+    def score_many(
+        self, sources: Sequence[Tuple[float, Optional[str], Optional[str]]]
+    ) -> np.ndarray:
+        """
+        Score many `(price, location, property_type)` sources at once.
+
+        Returns a (len(sources), len(self)) matrix; row i equals `score(*sources[i])`.
+        """
+        return self.combine(*self.components_many(*self.encode_sources(sources)))
+
+    @staticmethod
+    def top_k(
+        scores: np.ndarray,
+        min_score: float,
+        limit: int,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the rows of the `limit` highest scores at or above `min_score`.
+
+        Ties keep catalog order, matching a stable descending sort.
+        """
+        eligible = scores >= min_score
+        if mask is not None:
+            eligible &= mask
+        rows = np.flatnonzero(eligible)
+        if limit <= 0:
+            rows = rows[:0]
+        elif len(rows) > limit:
+            candidate_scores = scores[rows]
+            kth = np.argpartition(-candidate_scores, limit - 1)[limit - 1]
+            rows = rows[candidate_scores >= candidate_scores[kth]]
+        order = np.argsort(-scores[rows], kind='stable')[:max(limit, 0)]
+        rows = rows[order]
+        return rows, scores[rows]
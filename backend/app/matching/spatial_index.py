@@ -0,0 +1,53 @@
+from typing import Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def to_unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Project degrees of latitude/longitude onto the unit sphere."""
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_miles(chord: np.ndarray) -> np.ndarray:
+    """Great-circle distance for a straight-line distance between unit vectors."""
+    return 2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0)) * EARTH_RADIUS_MILES
+
+
+def miles_to_chord(miles: float) -> float:
+    return 2.0 * np.sin(min(miles / EARTH_RADIUS_MILES, np.pi) / 2.0)
+
+
+class SpatialIndex:
+    """
+    KD-tree over geocoded catalog rows.
+
+    Points live on the unit sphere, so a great-circle radius is an exact
+    Euclidean ball around the query point and lookups are sub-linear.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray):
+        # Rows without coordinates are simply not indexed
+        self.rows = np.flatnonzero(~(np.isnan(latitudes) | np.isnan(longitudes)))
+        self.points = to_unit_vectors(latitudes[self.rows], longitudes[self.rows])
+        self.tree = cKDTree(self.points)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def query_radius(
+        self, latitude: float, longitude: float, radius_miles: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Catalog rows within `radius_miles` of a point, in catalog order, with their distances."""
+        if not len(self.rows):
+            return self.rows, np.zeros(0)
+        point = to_unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+        found = np.sort(np.asarray(self.tree.query_ball_point(point, miles_to_chord(radius_miles)), dtype=np.int64))
+        distances = chord_to_miles(np.linalg.norm(self.points[found] - point, axis=1))
+        # The ball is a chord bound; drop float noise just outside the radius
+        keep = distances <= radius_miles
+        return self.rows[found[keep]], distances[keep]
@@ -1,4 +1,7 @@
 from app.db.base_class import Base
 from app.models.user import User
 from app.models.property import Property
-from app.models.exchange import Exchange 
\ No newline at end of file
+from app.models.exchange import Exchange
+from app.models.property_match import PropertyMatch 
+from app.models.chain_search_job import ChainSearchJob
+from app.models.catalog_version import CatalogVersion
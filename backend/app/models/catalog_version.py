@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, Integer
+
+from app.db.base_class import Base
+
+class CatalogVersion(Base):
+    """Single-row counter bumped by every property write, used to key cached match results."""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, JSON, String
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+# Jobs in these states still hold their request hash
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+class ChainSearchJob(Base):
+    __tablename__ = "chain_search_jobs"
+
+    id = Column(String(32), primary_key=True)
+    request_hash = Column(String(64), nullable=False, index=True)
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+    params = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="queued")
+    progress = Column(Float, nullable=False, default=0.0)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Set by the worker that claimed the job; its writes only land while the token still matches
+    lease_token = Column(String(32), nullable=True)
+    # Refreshed by the running worker on a timer, so stale running jobs can be recovered
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+# At most one queued or running job per distinct request
+Index(
+    "ix_chain_search_jobs_active_request_hash",
+    ChainSearchJob.request_hash,
+    unique=True,
+    postgresql_where=ChainSearchJob.status.in_(ACTIVE_JOB_STATUSES),
+    sqlite_where=ChainSearchJob.status.in_(ACTIVE_JOB_STATUSES),
+)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Float, Integer
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+class MatchStoreBuild(Base):
+    """Single row written by a completed property_matches build; until it exists, reads score live."""
+    __tablename__ = "match_store_build"
+
+    id = Column(Integer, primary_key=True)
+    # Every pair scoring at least this much was stored
+    min_score = Column(Float, nullable=False)
+    built_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Column, Integer, SmallInteger, String, Float, ForeignKey, DateTime, Index, event
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
+from app.core.geocoding import geocode
+from app.core.normalization import property_type_code, split_location
+from app.db import full_text
 from app.db.base_class import Base
 
 class Property(Base):
@@ -10,9 +13,16 @@ class Property(Base):
     id = Column(Integer, primary_key=True, index=True)
     address = Column(String, index=True)
     location = Column(String, index=True)
+    # Parsed from location on write, lowercased
+    city = Column(String, index=True)
+    state = Column(String, index=True)
+    # From the bundled gazetteer; null when the city is not listed
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     price = Column(Float)
     description = Column(String, nullable=True)
     property_type = Column(String)
+    property_type_code = Column(SmallInteger, index=True)
     square_footage = Column(Float)
     year_built = Column(Integer)
     bedrooms = Column(Integer, nullable=True)
@@ -23,4 +33,32 @@ class Property(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     owner = relationship("User", back_populates="properties")
-    exchanges_as_relinquished = relationship("Exchange", back_populates="relinquished_property", foreign_keys="[Exchange.relinquished_property_id]") 
\ No newline at end of file
+    exchanges_as_relinquished = relationship("Exchange", back_populates="relinquished_property", foreign_keys="[Exchange.relinquished_property_id]") 
+
+    @validates("location")
+    def normalize_location(self, key, location):
+        self.city, self.state = split_location(location)
+        self.latitude, self.longitude = geocode(self.city, self.state) or (None, None)
+        return location
+
+    @validates("property_type")
+    def normalize_property_type(self, key, property_type):
+        self.property_type_code = property_type_code(property_type)
+        return property_type
+
+# Equality filters first, then the price range (crud.property.filter_query)
+Index("ix_properties_status_type_price", Property.status, Property.property_type_code, Property.price)
+# Trigram GIN index for the unanchored location ilike; needs pg_trgm, so Postgres only
+event.listen(
+    Property.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+Index(
+    "ix_properties_location_trgm",
+    Property.location,
+    postgresql_using="gin",
+    postgresql_ops={"location": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+# Full-text search index (app.db.full_text)
+event.listen(Property.__table__, "after_create", full_text.install)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index, JSON
+
+from app.db.base_class import Base
+
+class PropertyMatch(Base):
+    __tablename__ = "property_matches"
+
+    source_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    target_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True, index=True)
+    score = Column(Float, nullable=False)
+    components = Column(JSON)
+
+Index("ix_property_matches_source_id_score", PropertyMatch.source_id, PropertyMatch.score.desc())
+
+class PropertyMatchStaging(Base):
+    """
+    Full builds by precompute land here first and are swapped into
+    property_matches in one transaction. No foreign keys: pairs of
+    properties deleted during a build are dropped by the swap.
+    """
+    __tablename__ = "property_matches_staging"
+
+    source_id = Column(Integer, primary_key=True)
+    target_id = Column(Integer, primary_key=True)
+    score = Column(Float, nullable=False)
+    components = Column(JSON)
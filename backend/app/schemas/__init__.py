@@ -1,12 +1,15 @@
-from .property import Property, PropertyCreate, PropertyUpdate
+from .property import Property, PropertyCreate, PropertyImportError, PropertyImportReport, PropertyUpdate
 from .token import Token, TokenPayload
 from .user import User, UserCreate, UserUpdate
 from .exchange import Exchange, ExchangeCreate, ExchangeUpdate
+from .chain_search_job import ChainSearchJob
 
 __all__ = [
     "Property",
     "PropertyCreate",
     "PropertyUpdate",
+    "PropertyImportError",
+    "PropertyImportReport",
     "Token",
     "TokenPayload",
     "User",
@@ -15,4 +18,5 @@ __all__ = [
     "Exchange",
     "ExchangeCreate",
     "ExchangeUpdate",
+    "ChainSearchJob",
 ] 
\ No newline at end of file
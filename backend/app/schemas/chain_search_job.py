@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class ChainSearchJob(BaseModel):
+    id: str
+    property_id: int
+    params: Dict[str, Any]
+    status: str
+    progress: float
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class PropertyBase(BaseModel):
@@ -23,6 +23,8 @@ class PropertyUpdate(PropertyBase):
 class Property(PropertyBase):
     id: int
     owner_id: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -30,4 +32,13 @@ class Property(PropertyBase):
         from_attributes = True
         json_encoders = {
             datetime: lambda dt: dt.isoformat() if dt else None
-        } 
\ No newline at end of file
+        } 
+
+class PropertyImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class PropertyImportReport(BaseModel):
+    created: int
+    failed: int
+    errors: List[PropertyImportError]
@@ -5,4 +5,5 @@ class Token(BaseModel):
     token_type: str
 
 class TokenPayload(BaseModel):
-    sub: str | None = None 
\ No newline at end of file
+    sub: str | None = None
+    exp: int | None = None 
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Recall and latency of approximate candidate generation against the exact scorer.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_candidate_recall --rows 1m --probes 0,2,4,8,16,all
+
+`all` probes every bucket, so its recall must be 1.0.
+
+With --endpoint, the same queries also go through
+PropertyMatcher.find_matching_properties, the path behind
+GET /properties/{id}/matches, on a SQLite copy of the catalog with the
+match store built, so `probes` is measured where stored matches could
+answer too. Building the store scores every pair; keep --rows near 10k.
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List, Set, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.normalization import PROPERTY_TYPE_CODES
+from app.db import base  # noqa: F401
+from app.matching.candidate_index import BucketIndex
+from app.matching.property_matcher import PropertyMatcher
+from app.matching.scoring_engine import ScoringEngine
+from app.models.catalog_version import CatalogVersion
+from app.models.match_store_build import MatchStoreBuild
+from app.models.property import Property
+from app.models.property_match import PropertyMatch
+from app.models.user import User
+from benchmarks.synthetic import catalog_rows, parse_size, populate
+
+TABLES = [
+    User.__table__, Property.__table__, PropertyMatch.__table__, CatalogVersion.__table__, MatchStoreBuild.__table__,
+]
+
+
+def type_classes() -> dict:
+    return {
+        code: PropertyMatcher.TYPE_COMPATIBILITY_CLASSES[name]
+        for name, code in PROPERTY_TYPE_CODES.items()
+    }
+
+
+def exact_top_k(engine: ScoringEngine, row: int, min_score: float, limit: int) -> np.ndarray:
+    owner_id = int(engine.owner_ids[row])
+    rows, _ = engine.top_k(
+        engine.score_row(row), min_score, limit,
+        mask=engine.candidate_mask(int(engine.ids[row]), owner_id),
+    )
+    return rows
+
+
+def approximate_top_k(
+    engine: ScoringEngine, index: BucketIndex, row: int, min_score: float, limit: int, probes: int
+) -> np.ndarray:
+    rows = index.candidates(
+        engine.prices[row], int(engine.city_codes[row]), int(engine.state_codes[row]), int(engine.type_codes[row]),
+        min_score, probes,
+    )
+    value, location, type_ = engine.components_many(*engine.row_sources(np.array([row])), targets=rows)
+    scores = engine.combine(value[0], location[0], type_[0])
+    mask = engine.candidate_mask(int(engine.ids[row]), int(engine.owner_ids[row]))[rows]
+    top_rows, _ = engine.top_k(scores, min_score, limit, mask=mask)
+    return rows[top_rows]
+
+
+def probe_settings(value: str, index: BucketIndex) -> List[Tuple[str, int]]:
+    """(label, probes) per --probes entry; `all` covers every bucket in the index."""
+    return [(setting, len(index) if setting == "all" else int(setting)) for setting in value.split(",")]
+
+
+def report(label: str, found: int, relevant: int, latencies: List[float], exact_ms: List[float]) -> None:
+    recall = found / relevant if relevant else 1.0
+    print(
+        f"{label:>8} {recall:>8.3f} {np.percentile(latencies, 50):>8.2f} "
+        f"{np.percentile(latencies, 95):>8.2f} {np.median(exact_ms) / np.median(latencies):>8.1f}"
+    )
+
+
+def time_endpoint(args, source_ids: List[int], exact_ms: List[float]) -> None:
+    """Time find_matching_properties per probes setting, with and without probes, over a built match store."""
+    with tempfile.TemporaryDirectory() as scratch:
+        engine = create_engine(f"sqlite:///{os.path.join(scratch, 'recall.db')}")
+        try:
+            for table in TABLES:
+                table.create(engine)
+            populate(engine, args.rows, args.seed)
+            db = sessionmaker(bind=engine)()
+            try:
+                sources = [db.get(Property, source_id) for source_id in source_ids]
+                # Expected matches from this catalog's exact scan, so ties break the same way
+                settings.MATCH_STORE_ENABLED = False
+                expected_ids: List[Set[int]] = [
+                    {prop.id for prop, _ in PropertyMatcher.find_matching_properties(db, source, args.min_score, args.limit)}
+                    for source in sources
+                ]
+                settings.MATCH_STORE_ENABLED = True
+                started = time.perf_counter()
+                PropertyMatcher.rebuild_stored_matches(db)
+                db.commit()
+                print(f"endpoint path: match store built in {time.perf_counter() - started:.1f}s")
+                probe_counts = probe_settings(args.probes, PropertyMatcher.candidate_index(db)[1])
+                for label, probes in [("store", None)] + probe_counts:
+                    found = relevant = 0
+                    latencies = []
+                    for source, expected in zip(sources, expected_ids):
+                        started = time.perf_counter()
+                        matches = PropertyMatcher.find_matching_properties(
+                            db, source, args.min_score, args.limit, probes=probes
+                        )
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        found += len(expected & {prop.id for prop, _ in matches})
+                        relevant += len(expected)
+                    report(label, found, relevant, latencies, exact_ms)
+            finally:
+                db.close()
+        finally:
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=parse_size, default=200_000, help="Row count, or 1k/10k/100k/1m")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--min-score", type=float, default=0.6)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--probes", default="0,1,2,4,8,16,all", help="Comma-separated; `all` probes every bucket")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--endpoint", action="store_true",
+                        help="Also time find_matching_properties over a SQLite catalog with the match store built")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows, available = catalog_rows(args.rows, args.seed)
+    # Only available listings are candidates, as in PropertyMatcher.candidate_columns
+    engine = PropertyMatcher.build_engine([row for row, keep in zip(rows, available) if keep])
+    index = BucketIndex(engine, type_classes())
+    print(f"catalog: {len(engine)} rows, {len(index)} buckets, built in {time.perf_counter() - started:.1f}s")
+
+    queries = np.random.default_rng(args.seed + 1).choice(len(engine), size=args.queries, replace=False)
+    exact, exact_ms = [], []
+    for row in queries:
+        started = time.perf_counter()
+        exact.append(set(exact_top_k(engine, row, args.min_score, args.limit).tolist()))
+        exact_ms.append((time.perf_counter() - started) * 1000)
+    print(f"{'probes':>8} {'recall':>8} {'p50 ms':>8} {'p95 ms':>8} {'speedup':>8}")
+    print(f"{'exact':>8} {1.0:>8.3f} {np.percentile(exact_ms, 50):>8.2f} {np.percentile(exact_ms, 95):>8.2f} {1.0:>8.1f}")
+
+    probe_counts = probe_settings(args.probes, index)
+    for label, probes in probe_counts:
+        found = relevant = 0
+        latencies = []
+        for row, expected in zip(queries, exact):
+            started = time.perf_counter()
+            got = approximate_top_k(engine, index, row, args.min_score, args.limit, probes)
+            latencies.append((time.perf_counter() - started) * 1000)
+            found += len(expected & set(got.tolist()))
+            relevant += len(expected)
+        report(label, found, relevant, latencies, exact_ms)
+
+    if args.endpoint:
+        time_endpoint(args, engine.ids[queries].tolist(), exact_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Matcher benchmark suite over seeded synthetic catalogs.
+
+Times PropertyMatcher.calculate_match_score, find_matching_properties and
+identify_exchange_chains across thresholds and chain lengths, and writes
+throughput, latency percentiles and peak traced memory as JSON.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_matcher --sizes 1k,10k,100k --output matcher.json
+
+Each size is loaded into a fresh SQLite file unless --database-url points
+at an empty scratch database.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db import base  # noqa: F401
+from app.matching.property_matcher import PropertyMatcher
+from app.models.catalog_version import CatalogVersion
+from app.models.match_store_build import MatchStoreBuild
+from app.models.property import Property
+from app.models.property_match import PropertyMatch
+from app.models.user import User
+from benchmarks.synthetic import parse_size, populate
+
+# Tables the matcher touches; the rest of the schema is not needed
+TABLES = [
+    User.__table__, Property.__table__, PropertyMatch.__table__, CatalogVersion.__table__, MatchStoreBuild.__table__,
+]
+
+
+def summarize(
+    benchmark: str,
+    rows: int,
+    params: Dict,
+    latencies: List[float],
+    items: int,
+    peak_memory: Optional[int],
+) -> Dict:
+    """One result record; `items` is the number of units of work across all iterations."""
+    latencies_ms = np.array(latencies) * 1000
+    total = float(np.sum(latencies))
+    return {
+        "benchmark": benchmark,
+        "rows": rows,
+        "params": params,
+        "iterations": len(latencies),
+        "throughput_per_s": items / total if total else None,
+        "latency_ms": {
+            "mean": float(latencies_ms.mean()),
+            "p50": float(np.percentile(latencies_ms, 50)),
+            "p95": float(np.percentile(latencies_ms, 95)),
+            "p99": float(np.percentile(latencies_ms, 99)),
+            "max": float(latencies_ms.max()),
+        },
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def timed(call: Callable[[], object], iterations: int) -> List[float]:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def peak_memory(call: Callable[[], object]) -> int:
+    """Peak traced allocation of one extra call, kept out of the timed runs."""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_calculate_match_score(db: Session, size: int, pairs: int, seed: int) -> Dict:
+    properties = db.query(Property).limit(2000).all()
+    rng = random.Random(seed)
+    sample = [(rng.choice(properties), rng.choice(properties)) for _ in range(pairs)]
+    batch = 1000
+
+    def run_batch(start: int) -> None:
+        for source, target in sample[start:start + batch]:
+            PropertyMatcher.calculate_match_score(source, target)
+
+    latencies = []
+    for start in range(0, pairs, batch):
+        started = time.perf_counter()
+        run_batch(start)
+        latencies.append(time.perf_counter() - started)
+    return summarize(
+        "calculate_match_score", size, {"pairs_per_iteration": batch},
+        latencies, pairs, peak_memory(lambda: run_batch(0)),
+    )
+
+
+def bench_find_matching_properties(
+    db: Session, size: int, sources: List[Property], min_score: float, limit: int
+) -> Dict:
+    queue = iter(sources)
+    latencies = timed(
+        lambda: PropertyMatcher.find_matching_properties(db, next(queue), min_score, limit),
+        len(sources),
+    )
+    return summarize(
+        "find_matching_properties", size, {"min_score": min_score, "limit": limit},
+        latencies, len(sources),
+        peak_memory(lambda: PropertyMatcher.find_matching_properties(db, sources[0], min_score, limit)),
+    )
+
+
+def bench_identify_exchange_chains(
+    db: Session, size: int, sources: List[Property], max_chain_length: int, min_score: float
+) -> Dict:
+    queue = iter(sources)
+    latencies = timed(
+        lambda: PropertyMatcher.identify_exchange_chains(db, next(queue), max_chain_length, min_score),
+        len(sources),
+    )
+    return summarize(
+        "identify_exchange_chains", size,
+        {"max_chain_length": max_chain_length, "min_score": min_score},
+        latencies, len(sources),
+        peak_memory(
+            lambda: PropertyMatcher.identify_exchange_chains(db, sources[0], max_chain_length, min_score)
+        ),
+    )
+
+
+def run_size(args: argparse.Namespace, size: int, database_url: str) -> List[Dict]:
+    engine = create_engine(database_url)
+    for table in TABLES:
+        table.create(engine, checkfirst=True)
+    started = time.perf_counter()
+    populate(engine, size, args.seed)
+    print(f"[{size}] loaded catalog in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    db = sessionmaker(bind=engine)()
+    results = []
+    try:
+        if args.match_store:
+            latencies = timed(lambda: (PropertyMatcher.rebuild_stored_matches(db), db.commit()), 1)
+            results.append(summarize("rebuild_stored_matches", size, {}, latencies, size, None))
+
+        available = [prop_id for prop_id, in db.query(Property.id).filter(Property.status == "available")]
+        rng = random.Random(args.seed)
+        source_ids = rng.sample(available, min(args.queries, len(available)))
+        sources = PropertyMatcher.load_properties(db, source_ids)
+
+        results.append(bench_calculate_match_score(db, size, args.pairs, args.seed))
+        for min_score in args.thresholds:
+            results.append(bench_find_matching_properties(db, size, sources, min_score, args.limit))
+            print(f"[{size}] find_matching_properties min_score={min_score}", file=sys.stderr)
+        chain_sources = sources[:args.chain_queries]
+        for max_chain_length in args.chain_lengths:
+            for min_score in args.thresholds:
+                results.append(
+                    bench_identify_exchange_chains(db, size, chain_sources, max_chain_length, min_score)
+                )
+                print(
+                    f"[{size}] identify_exchange_chains length={max_chain_length} min_score={min_score}",
+                    file=sys.stderr,
+                )
+    finally:
+        db.close()
+        engine.dispose()
+    return results
+
+
+def parse_list(cast):
+    return lambda value: [cast(item) for item in value.split(",") if item]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the property matcher on synthetic catalogs.")
+    parser.add_argument("--sizes", type=parse_list(parse_size), default=[1_000, 10_000],
+                        help="Catalog sizes, e.g. 1k,10k,100k,1m")
+    parser.add_argument("--thresholds", type=parse_list(float), default=[0.6, 0.7, 0.8])
+    parser.add_argument("--chain-lengths", type=parse_list(int), default=[2, 3, 4])
+    parser.add_argument("--queries", type=int, default=50, help="Source properties per match benchmark")
+    parser.add_argument("--chain-queries", type=int, default=10, help="Source properties per chain benchmark")
+    parser.add_argument("--pairs", type=int, default=20_000, help="Pairs scored by calculate_match_score")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--match-store", action="store_true",
+                        help="Build and read property_matches instead of scoring live")
+    parser.add_argument("--database-url", help="Empty scratch database to use instead of SQLite files")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    settings.MATCH_STORE_ENABLED = args.match_store
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for size in args.sizes:
+            database_url: Optional[str] = args.database_url
+            if database_url is None:
+                database_url = f"sqlite:///{os.path.join(scratch, f'catalog-{size}.db')}"
+            elif len(args.sizes) > 1:
+                raise SystemExit("--database-url takes a single size")
+            results.extend(run_size(args, size, database_url))
+
+    report = json.dumps({
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "match_store": args.match_store,
+        },
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Seeded synthetic property catalogs for benchmarks.
+
+Catalogs have a skewed type mix, listings clustered in a few large metros
+(Zipf-weighted over the bundled gazetteer) and log-normal prices per type.
+The same seed always yields the same catalog.
+"""
+import csv
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.core.geocoding import GAZETTEER_PATH
+from app.core.normalization import property_type_code, split_location
+from app.models.property import Property
+from app.models.user import User
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Share of listings and (median price, log-normal sigma) per type
+TYPE_MIX = {
+    "residential": (0.55, 450_000, 0.6),
+    "multi_family": (0.15, 1_200_000, 0.7),
+    "commercial": (0.12, 2_500_000, 0.9),
+    "retail": (0.08, 1_800_000, 0.8),
+    "industrial": (0.06, 3_000_000, 0.9),
+    "land": (0.04, 300_000, 1.0),
+}
+STATUS_MIX = {"available": 0.9, "pending": 0.07, "exchanged": 0.03}
+
+# Listings are spread over this many of the largest gazetteer places
+METROS = 125
+
+# Zipf exponents: a few metros and a few large owners dominate
+CITY_SKEW = 1.1
+OWNER_SKEW = 0.8
+
+BATCH_SIZE = 10_000
+
+
+def parse_size(value: str) -> int:
+    """Accept 1k/10k/100k/1m or a plain row count."""
+    return SIZES.get(value.lower()) or int(value)
+
+
+def _zipf_weights(count: int, skew: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, count + 1) ** skew
+    return weights / weights.sum()
+
+
+def _cities() -> List[Tuple[str, str, float, float]]:
+    """The METROS most populous gazetteer places, one spelling each."""
+    with open(GAZETTEER_PATH, newline="") as gazetteer:
+        rows = sorted(csv.DictReader(gazetteer), key=lambda row: (-int(row["population"]), row["city"]))
+    cities: Dict[Tuple[float, float], Tuple[str, str, float, float]] = {}
+    for row in rows:
+        coordinates = (float(row["latitude"]), float(row["longitude"]))
+        cities.setdefault(coordinates, (row["city"], row["state"], *coordinates))
+        if len(cities) == METROS:
+            break
+    return list(cities.values())
+
+
+def generate_properties(size: int, seed: int = 0, owners: int = 0) -> Iterator[Dict]:
+    """
+    Yield `size` property rows as column dicts, normalized columns included.
+
+    Owner ids run from 1 to `owners` (default: one owner per four listings).
+    """
+    rng = np.random.default_rng(seed)
+    owners = owners or max(size // 4, 1)
+
+    cities = _cities()
+    city_order = rng.permutation(len(cities))
+    city_picks = city_order[rng.choice(len(cities), size=size, p=_zipf_weights(len(cities), CITY_SKEW))]
+
+    type_names = list(TYPE_MIX)
+    type_picks = rng.choice(len(type_names), size=size, p=[TYPE_MIX[name][0] for name in type_names])
+    medians = np.array([TYPE_MIX[name][1] for name in type_names])[type_picks]
+    sigmas = np.array([TYPE_MIX[name][2] for name in type_names])[type_picks]
+    prices = np.maximum(np.round(medians * np.exp(rng.normal(0.0, sigmas)), -3), 1000.0)
+
+    owner_order = rng.permutation(owners) + 1
+    owner_picks = owner_order[rng.choice(owners, size=size, p=_zipf_weights(owners, OWNER_SKEW))]
+    statuses = rng.choice(list(STATUS_MIX), size=size, p=list(STATUS_MIX.values()))
+    footage = np.round(rng.lognormal(np.log(1800), 0.5, size=size))
+    years = rng.integers(1900, 2025, size=size)
+    bedrooms = rng.integers(1, 6, size=size)
+
+    for i in range(size):
+        city, state, latitude, longitude = cities[city_picks[i]]
+        location = f"{city}, {state}"
+        property_type = type_names[type_picks[i]]
+        residential = property_type in ("residential", "multi_family")
+        normalized_city, normalized_state = split_location(location)
+        yield {
+            "address": f"{i + 1} Market St",
+            "location": location,
+            "city": normalized_city,
+            "state": normalized_state,
+            "latitude": latitude,
+            "longitude": longitude,
+            "price": float(prices[i]),
+            "description": None,
+            "property_type": property_type,
+            "property_type_code": property_type_code(property_type),
+            "square_footage": float(footage[i]),
+            "year_built": int(years[i]),
+            "bedrooms": int(bedrooms[i]) if residential else None,
+            "bathrooms": float(bedrooms[i]) if residential else None,
+            "status": str(statuses[i]),
+            "owner_id": int(owner_picks[i]),
+        }
+
+
+def catalog_rows(size: int, seed: int = 0) -> Tuple[List[Tuple], np.ndarray]:
+    """
+    Rows in the PropertyMatcher.candidate_columns shape, with ids from 1, and
+    a mask of the available ones, for benchmarks that skip the database.
+    """
+    rows, available = [], []
+    for prop_id, prop in enumerate(generate_properties(size, seed), start=1):
+        rows.append((
+            prop_id, prop["owner_id"], prop["price"], prop["location"], prop["city"],
+            prop["state"], prop["property_type_code"], prop["latitude"], prop["longitude"],
+        ))
+        available.append(prop["status"] == "available")
+    return rows, np.array(available, dtype=bool)
+
+
+def populate(engine: Engine, size: int, seed: int = 0) -> None:
+    """Insert owners and a synthetic catalog into an empty database."""
+    owners = max(size // 4, 1)
+    with engine.begin() as connection:
+        for start in range(1, owners + 1, BATCH_SIZE):
+            connection.execute(insert(User), [
+                {"id": owner_id, "email": f"owner{owner_id}@example.com", "hashed_password": "!", "is_active": True}
+                for owner_id in range(start, min(start + BATCH_SIZE, owners + 1))
+            ])
+        batch = []
+        for prop in generate_properties(size, seed, owners):
+            batch.append(prop)
+            if len(batch) == BATCH_SIZE:
+                connection.execute(insert(Property), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(Property), batch)
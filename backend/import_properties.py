@@ -0,0 +1,40 @@
+import argparse
+import sys
+
+from app import crud
+from app.crud import property_import
+from app.db import base  # noqa: F401
+from app.db.session import SessionLocal
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-import property listings from CSV or NDJSON.")
+    parser.add_argument("path", help="File to import, or - for stdin")
+    parser.add_argument("--owner-email", required=True, help="Existing user who will own the listings")
+    parser.add_argument("--format", choices=property_import.FORMATS, help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, help="Rows per transaction (default: IMPORT_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    fmt = args.format or property_import.detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot tell the file format from the name; pass --format")
+
+    db = SessionLocal()
+    try:
+        owner = crud.user.get_by_email(db, email=args.owner_email)
+        if owner is None:
+            parser.error(f"no user with email {args.owner_email}")
+        stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+        with stream:
+            report = property_import.import_properties(
+                db, stream, fmt, owner_id=owner.id, batch_size=args.batch_size
+            )
+    finally:
+        db.close()
+
+    for error in report.errors:
+        print(f"row {error.row}: {'; '.join(error.errors)}", file=sys.stderr)
+    print(f"Imported {report.created} properties, {report.failed} rows failed")
+    sys.exit(1 if report.failed else 0)
+
+if __name__ == "__main__":
+    main()
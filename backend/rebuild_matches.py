@@ -0,0 +1,16 @@
+from app.db.session import SessionLocal
+from app.db import base  # noqa: F401
+from app.matching.property_matcher import PropertyMatcher
+
+def rebuild_matches() -> None:
+    db = SessionLocal()
+    try:
+        written = PropertyMatcher.rebuild_stored_matches(db)
+        db.commit()
+        print(f"Stored {written} property matches")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Rebuilding property matches...")
+    rebuild_matches()
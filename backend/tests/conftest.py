@@ -0,0 +1,75 @@
+"""
+Tests run against a throwaway SQLite database holding a small seeded
+catalog. DATABASE_URL must point at it before the app is imported, since
+app.db.session binds its engines at import time.
+"""
+import os
+import tempfile
+
+_scratch = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch.name, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import update  # noqa: E402
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler  # noqa: E402
+
+# Exchange.property_ids is a Postgres ARRAY; SQLite keeps it as JSON
+SQLiteTypeCompiler.visit_ARRAY = lambda self, type_, **kw: "JSON"
+
+from app.core.config import settings  # noqa: E402
+from app.core.principals import principal_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db import base  # noqa: E402,F401
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.matching.property_matcher import PropertyMatcher  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.synthetic import populate  # noqa: E402
+
+CATALOG_SIZE = 400
+SEED = 0
+
+
+def reset_caches() -> None:
+    """Drop process-wide caches keyed by catalog version, which restarts at 0 with every fresh database."""
+    PropertyMatcher._catalog_engine = None
+    PropertyMatcher._candidate_index = None
+    PropertyMatcher._match_cache.clear()
+    principal_cache.clear()
+
+
+@pytest.fixture
+def catalog():
+    """A fresh database with owners 1..100 and properties 1..400; the match store is enabled but not built."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    populate(engine, CATALOG_SIZE, SEED)
+    reset_caches()
+    match_store_enabled = settings.MATCH_STORE_ENABLED
+    settings.MATCH_STORE_ENABLED = True
+    yield
+    settings.MATCH_STORE_ENABLED = match_store_enabled
+    reset_caches()
+
+
+@pytest.fixture
+def db(catalog):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(catalog):
+    """An API client signed in as owner 1, made a superuser so every listing is reachable."""
+    with engine.begin() as connection:
+        connection.execute(update(User).where(User.id == 1).values(is_superuser=True))
+    # Not entered as a context manager: startup would calibrate bcrypt and resume jobs
+    test_client = TestClient(app)
+    test_client.headers["Authorization"] = f"Bearer {create_access_token(1)}"
+    return test_client
@@ -0,0 +1,50 @@
+from app.models.property import Property
+
+PROPERTIES = "/api/v1/properties/"
+
+
+def test_cursor_pages_cover_every_property_once(client, db):
+    ids, cursor = [], None
+    while True:
+        response = client.get(PROPERTIES, params={"limit": 37, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids += [prop["id"] for prop in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert ids == [prop_id for prop_id, in db.query(Property.id).order_by(Property.id)]
+
+
+def test_bad_cursor_is_rejected(client):
+    assert client.get(PROPERTIES, params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_cursor_cannot_be_combined_with_skip(client):
+    cursor = client.get(PROPERTIES, params={"limit": 5}).headers["X-Next-Cursor"]
+    assert client.get(PROPERTIES, params={"cursor": cursor, "skip": 5}).status_code == 400
+
+
+def test_non_positive_limit_is_rejected(client):
+    assert client.get(PROPERTIES, params={"limit": 0}).status_code == 422
+    assert client.get(PROPERTIES, params={"limit": -1}).status_code == 422
+    assert client.get("/api/v1/exchanges/", params={"limit": 0}).status_code == 422
+
+
+def test_matches_honour_if_none_match(client):
+    url = "/api/v1/properties/1/matches"
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert client.get(url, params={"min_score": 0.7}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_matches_etag_changes_with_the_catalog(client):
+    url = "/api/v1/properties/1/matches"
+    etag = client.get(url).headers["ETag"]
+    listing = client.get("/api/v1/properties/2").json()
+    assert client.put("/api/v1/properties/2", json={**listing, "price": listing["price"] * 1.1}).status_code == 200
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
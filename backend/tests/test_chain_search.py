@@ -0,0 +1,70 @@
+from typing import List, Set
+
+import pytest
+
+from app.core.config import settings
+from app.matching.chain_search import Chain, best_first_chains, depth_first_chains
+from app.matching.property_matcher import PropertyMatcher
+from app.models.property import Property
+
+MIN_SCORE = 0.6
+
+
+def baseline_chains(db, source: Property, max_chain_length: int) -> List[Chain]:
+    """The original recursive search, one find_matching_properties call per expanded node."""
+    def build_chains(current: Property, chain: Chain, visited: Set[int]) -> List[Chain]:
+        if len(chain) >= max_chain_length:
+            return [chain]
+        chains = []
+        for match, score in PropertyMatcher.find_matching_properties(db, current, MIN_SCORE):
+            if match.id not in visited:
+                extended = chain + [(match.id, score)]
+                if len(extended) > 1:
+                    chains.append(extended)
+                chains.extend(build_chains(match, extended, visited | {match.id}))
+        return chains
+
+    return build_chains(source, [], {source.id})
+
+
+def average(chain: Chain) -> float:
+    return sum(score for _, score in chain) / len(chain)
+
+
+@pytest.fixture
+def sources(db):
+    settings.MATCH_STORE_ENABLED = False
+    return db.query(Property).filter(Property.status == "available").order_by(Property.id).limit(5).all()
+
+
+@pytest.mark.parametrize("max_chain_length", [1, 2, 3])
+def test_depth_first_matches_baseline(db, sources, max_chain_length):
+    for source in sources:
+        graph = PropertyMatcher.build_match_graph(db, source, MIN_SCORE)
+        assert list(depth_first_chains(graph, source.id, max_chain_length)) == baseline_chains(
+            db, source, max_chain_length
+        )
+
+
+@pytest.mark.parametrize("max_chain_length,top_k", [(2, 5), (3, 10), (3, 1)])
+def test_best_first_top_k_matches_exhaustive(db, sources, max_chain_length, top_k):
+    for source in sources:
+        graph = PropertyMatcher.build_match_graph(db, source, MIN_SCORE)
+        # The depth-first walk yields full-length chains twice
+        exhaustive = {tuple(chain) for chain in depth_first_chains(graph, source.id, max_chain_length)}
+        expected = sorted(exhaustive, key=average, reverse=True)[:top_k]
+
+        result = best_first_chains(graph, source.id, max_chain_length, top_k)
+
+        assert result.exhaustive
+        assert [average(chain) for chain in result.chains] == pytest.approx([average(chain) for chain in expected])
+        assert all(tuple(chain) in exhaustive for chain in result.chains)
+        assert len({tuple(chain) for chain in result.chains}) == len(result.chains)
+
+
+def test_chain_length_must_be_positive(db, sources):
+    graph = PropertyMatcher.build_match_graph(db, sources[0], MIN_SCORE)
+    with pytest.raises(ValueError):
+        list(depth_first_chains(graph, sources[0].id, 0))
+    with pytest.raises(ValueError):
+        best_first_chains(graph, sources[0].id, 0, 10)
@@ -0,0 +1,72 @@
+from typing import List, Tuple
+
+from app import crud
+from app.core.config import settings
+from app.matching import match_store
+from app.matching.property_matcher import PropertyMatcher
+from app.models.property_match import PropertyMatch
+from app.schemas.property import PropertyCreate
+
+
+def stored_pairs(db) -> List[Tuple[int, int, float]]:
+    return [
+        (source_id, target_id, round(score, 9))
+        for source_id, target_id, score in db.query(
+            PropertyMatch.source_id, PropertyMatch.target_id, PropertyMatch.score
+        ).order_by(PropertyMatch.source_id, PropertyMatch.target_id)
+    ]
+
+
+def assert_store_matches_rebuild(db) -> None:
+    incremental = stored_pairs(db)
+    PropertyMatcher.rebuild_stored_matches(db)
+    db.commit()
+    assert incremental == stored_pairs(db)
+
+
+def listing(**overrides) -> PropertyCreate:
+    fields = dict(
+        address="1 Test St", location="Austin, TX", price=450_000.0, property_type="residential",
+        square_footage=1800.0, year_built=2000,
+    )
+    fields.update(overrides)
+    return PropertyCreate(**fields)
+
+
+def test_writes_before_first_build_are_not_kept_up(db):
+    crud.property.create_with_owner(db, obj_in=listing(), owner_id=1)
+    assert not match_store.covers(db, 0.6)
+    assert stored_pairs(db) == []
+
+
+def test_store_stays_consistent_across_writes(db):
+    PropertyMatcher.rebuild_stored_matches(db)
+    db.commit()
+    assert match_store.covers(db, 0.6)
+
+    created = crud.property.create_with_owner(db, obj_in=listing(), owner_id=1)
+    assert any(created.id in pair[:2] for pair in stored_pairs(db))
+    assert_store_matches_rebuild(db)
+
+    crud.property.update(db, db_obj=created, obj_in={"price": 2_500_000.0, "property_type": "commercial"})
+    assert_store_matches_rebuild(db)
+
+    crud.property.update(db, db_obj=crud.property.get(db, id=5), obj_in={"status": "pending"})
+    assert_store_matches_rebuild(db)
+
+    crud.property.remove(db, id=created.id)
+    assert not any(created.id in pair[:2] for pair in stored_pairs(db))
+    assert_store_matches_rebuild(db)
+
+
+def test_stored_matches_equal_live_scoring(db):
+    source = crud.property.get(db, id=1)
+    PropertyMatcher.rebuild_stored_matches(db)
+    db.commit()
+    stored = {prop.id: score for prop, score in PropertyMatcher.find_matching_properties(db, source, 0.6, 400)}
+
+    settings.MATCH_STORE_ENABLED = False
+    live = {prop.id: score for prop, score in PropertyMatcher.find_matching_properties(db, source, 0.6, 400)}
+    assert stored.keys() == live.keys()
+    for prop_id, score in live.items():
+        assert abs(stored[prop_id] - score) < 1e-9
@@ -0,0 +1,21 @@
+import numpy as np
+
+from app.matching.property_matcher import PropertyMatcher
+from app.models.property import Property
+
+
+def test_scores_match_scalar_scorer(db):
+    engine = PropertyMatcher.build_engine(PropertyMatcher.candidate_columns(db).all())
+    targets = {prop.id: prop for prop in db.query(Property).filter(Property.id.in_(engine.ids.tolist()))}
+    ordered = [targets[prop_id] for prop_id in engine.ids.tolist()]
+
+    sources = db.query(Property).order_by(Property.id).limit(25).all()
+    # Sources the catalog vocabularies have never seen, and one without a state
+    sources += [
+        Property(id=-1, price=450_000.0, location="Nowhere, ZZ", property_type="residential"),
+        Property(id=-2, price=1_000_000.0, location="Austin", property_type="commercial"),
+    ]
+    for source in sources:
+        expected = np.array([PropertyMatcher.calculate_match_score(source, target) for target in ordered])
+        scores = engine.score(source.price, source.location, source.property_type)
+        np.testing.assert_array_equal(scores, expected)